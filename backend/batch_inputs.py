@@ -0,0 +1,91 @@
+"""Column access and fertilizer matrices for the batched yield/cost/risk models"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Union
+from reference import REFERENCE
+
+# Fertilizers in matrix column order (fertilizer IDs of the reference tables)
+FERTILIZER_NAMES = REFERENCE.fertilizer_names
+
+# Nutrient content (kg N, P, K per kg of product), one row per fertilizer
+NPK_MATRIX = REFERENCE.fertilizer_npk
+
+# Price (INR per kg) of each fertilizer
+FERTILIZER_COSTS = REFERENCE.fertilizer_cost
+
+# Anything the batched models accept as inputs: a dict of scalars/arrays, a structured array or a DataFrame
+BatchInputs = Union[Dict, np.ndarray, pd.DataFrame]
+
+FertilizerInput = Union[Dict[str, float], List[Dict[str, float]], np.ndarray]
+
+_MISSING = object()
+
+def batch_column(inputs: BatchInputs, key: str, default=_MISSING) -> np.ndarray:
+    """One numeric input column as a float array (scalars stay 0-d so they broadcast)"""
+    if isinstance(inputs, pd.DataFrame):
+        present = key in inputs.columns
+    elif isinstance(inputs, np.ndarray):
+        present = inputs.dtype.names is not None and key in inputs.dtype.names
+    else:
+        present = key in inputs
+    
+    if not present:
+        if default is _MISSING:
+            raise KeyError(f"Missing input column: {key}")
+        return np.asarray(default, dtype=float)
+    
+    values = inputs[key]
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    return np.asarray(values, dtype=float)
+
+def mix_applied(fertilizer_mix: Dict[str, float]) -> bool:
+    """
+    Whether a mix counts as fertilizer applied: some quantity is positive
+    The same rule as a quantity matrix (fertilizer_<Name> columns), where a
+    listed zero and an absent fertilizer cannot be told apart
+    """
+    return any(qty > 0 for qty in fertilizer_mix.values())
+
+def fertilizer_quantities(fertilizer_mix: FertilizerInput) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (quantities, applied) for one mix, a list of mixes or a quantity matrix
+    quantities are kg/hectare with the last axis in FERTILIZER_NAMES order
+    (unknown fertilizers contribute nothing); applied is False where no
+    positive quantity was given (see mix_applied), whatever the representation
+    """
+    if isinstance(fertilizer_mix, dict):
+        quantities = np.array([fertilizer_mix.get(name, 0.0) for name in FERTILIZER_NAMES], dtype=float)
+        return quantities, np.asarray(mix_applied(fertilizer_mix))
+    
+    if isinstance(fertilizer_mix, np.ndarray):
+        quantities = np.asarray(fertilizer_mix, dtype=float)
+        return quantities, (quantities > 0).any(axis=-1)
+    
+    mixes = list(fertilizer_mix)
+    quantities = np.array(
+        [[mix.get(name, 0.0) for name in FERTILIZER_NAMES] for mix in mixes], dtype=float
+    ).reshape(len(mixes), len(FERTILIZER_NAMES))
+    return quantities, np.array([mix_applied(mix) for mix in mixes], dtype=bool)
+
+def batch_fertilizer(inputs: BatchInputs) -> FertilizerInput:
+    """
+    Fertilizer of every row when the caller passes none explicitly: a
+    "fertilizer_mix" column of dicts, or fertilizer_<Name> quantity columns
+    """
+    if isinstance(inputs, pd.DataFrame):
+        names = list(inputs.columns)
+    elif isinstance(inputs, np.ndarray):
+        names = list(inputs.dtype.names or ())
+    else:
+        names = list(inputs)
+    
+    if "fertilizer_mix" in names:
+        mixes = inputs["fertilizer_mix"]
+        return mixes if isinstance(mixes, dict) else list(mixes)
+    
+    columns = [f"fertilizer_{name}" for name in FERTILIZER_NAMES]
+    if not any(column in names for column in columns):
+        return {}
+    quantities = np.broadcast_arrays(*[np.nan_to_num(batch_column(inputs, column, 0.0)) for column in columns])
+    return np.stack(quantities, axis=-1)
@@ -0,0 +1,4 @@
+"""
+Performance benchmarks for the engines, simulations and HTTP endpoints
+Run from backend/ with `python -m benchmarks` (see --help); these are not pytest tests
+"""
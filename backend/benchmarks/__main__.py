@@ -0,0 +1,145 @@
+"""
+Run the benchmark suite against synthetic datasets and compare with a JSON baseline
+
+    python -m benchmarks                       # compare with benchmarks/baseline.json
+    python -m benchmarks --save                # record a new baseline
+    python -m benchmarks --no-baseline         # just print the timings
+    python -m benchmarks --price-rows 1000000 --only macro.
+
+Exits with status 1 when a case's median is slower than the baseline by more than --threshold,
+or when there is no baseline to compare with (unless --save or --no-baseline is given)
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--price-rows", type=int, default=200000, help="Rows in the synthetic mandi price file")
+    parser.add_argument("--data-dir", type=Path, help="Keep the synthetic datasets here (reused if present)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="Baseline JSON to compare with / save to")
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--no-baseline", action="store_true", help="Only report timings; do not compare with a baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown of the median (0.25 = 25%%)")
+    parser.add_argument("--only", action="append", default=[], help="Run only cases whose name starts with this prefix")
+    parser.add_argument("--output", type=Path, help="Also write this run's results to a JSON file")
+    return parser.parse_args()
+
+def prepare_datasets(directory: Path, price_rows: int):
+    """Point config at directory (before any engine module is imported) and fill it with synthetic data"""
+    os.environ["DATA_DIR"] = str(directory)
+    os.environ["DATASET_SNAPSHOT_DIR"] = str(directory / ".snapshots")
+    os.environ["RESPONSE_CACHE_DB"] = ""
+    import config
+    from benchmarks.synthetic import write_crop_yields, write_mandi_prices
+    
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = directory / "price_rows.txt"
+    if stamp.exists() and stamp.read_text() == str(price_rows):
+        return
+    write_crop_yields(config.CROP_YIELD_FILE, config.CROPS)
+    write_mandi_prices(config.MANDI_PRICE_FILE, price_rows)
+    stamp.write_text(str(price_rows))
+
+def measure(case) -> Dict:
+    """Per-call timings in milliseconds over case.repeats samples of case.number calls"""
+    case.fn()  # warm-up (caches, lazy imports)
+    samples = []
+    for _ in range(case.repeats):
+        start = time.perf_counter()
+        for _ in range(case.number):
+            case.fn()
+        samples.append((time.perf_counter() - start) * 1e3 / case.number)
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(min(samples), 4),
+        "max_ms": round(max(samples), 4),
+        "calls": case.number * case.repeats
+    }
+
+def run_cases(cases: Dict, prefixes: List[str]) -> Dict[str, Dict]:
+    results = {}
+    for name, case in cases.items():
+        if prefixes and not any(name.startswith(prefix) for prefix in prefixes):
+            continue
+        results[name] = measure(case)
+        print(f"{name:<45} {results[name]['median_ms']:>12.4f} ms", flush=True)
+    return results
+
+def compare(results: Dict[str, Dict], baseline: Dict, threshold: float) -> List[str]:
+    """Descriptions of the cases whose median regressed past the threshold"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        ratio = result["median_ms"] / reference["median_ms"] if reference["median_ms"] > 0 else 1.0
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {result['median_ms']:.4f} ms vs baseline {reference['median_ms']:.4f} ms (+{(ratio - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as scratch:
+        prepare_datasets(args.data_dir or Path(scratch), args.price_rows)
+        
+        # Engine modules read config at import time, so they are imported only now
+        from fastapi.testclient import TestClient
+        import numpy
+        import pandas
+        from benchmarks.cases import endpoint_cases, engine_cases, startup_cases
+        
+        results = run_cases(startup_cases(), args.only)
+        results.update(run_cases(engine_cases(), args.only))
+        if not args.only or any(prefix.startswith("endpoint") or "endpoint".startswith(prefix) for prefix in args.only):
+            import main as app_module
+            with TestClient(app_module.app) as client:
+                results.update(run_cases(endpoint_cases(client, app_module.response_cache), args.only))
+    
+    report = {
+        "meta": {
+            "price_rows": args.price_rows,
+            "python": platform.python_version(),
+            "numpy": numpy.__version__,
+            "pandas": pandas.__version__,
+            "machine": platform.machine(),
+            "recorded": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": results
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.save:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    
+    if args.no_baseline:
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save to record one (or --no-baseline to skip the comparison)")
+        return 1
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["meta"]["price_rows"] != args.price_rows:
+        print(f"Baseline was recorded with --price-rows {baseline['meta']['price_rows']}; not comparable")
+        return 1
+    
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} in {len(results)} cases")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Benchmark cases: engine micro-benchmarks, what-if macro-benchmarks and in-process endpoint calls"""
+from typing import Callable, Dict, NamedTuple
+
+class Case(NamedTuple):
+    """fn is timed `number` times per sample (micro cases need many calls per sample)"""
+    fn: Callable[[], object]
+    number: int = 1
+    repeats: int = 5
+
+PLAN = {
+    "crop": "Rice",
+    "soil_type": "Alluvial",
+    "area_hectares": 2.0,
+    "seed_quality": 0.8,
+    "expected_rainfall": 1100.0,
+    "rainfall_delay": 5,
+    "irrigation_frequency": 3,
+    "fertilizer_mix": {"Urea": 100.0, "DAP": 50.0, "MOP": 30.0},
+    "pest_probability": 0.2,
+    "labour_days": 60.0,
+    "pest_control_intensity": 0.5,
+    "sale_month": 2,
+    "current_market_price": 2100.0,
+    "seed_quantity_kg": 100.0
+}
+
+def startup_cases() -> Dict[str, Case]:
+    """Building a DataLoader from the CSVs and from their snapshots"""
+    import config
+    from data_loader import DataLoader
+    
+    def load(snapshots: bool):
+        def run():
+            previous, config.DATASET_SNAPSHOTS = config.DATASET_SNAPSHOTS, snapshots
+            try:
+                DataLoader()
+            finally:
+                config.DATASET_SNAPSHOTS = previous
+        return run
+    
+    DataLoader()  # make sure the snapshots exist
+    return {
+        "startup.load_csv": Case(load(False), repeats=3),
+        "startup.load_snapshot": Case(load(True), repeats=5)
+    }
+
+def engine_cases() -> Dict[str, Case]:
+    """Single calls into the engines and data loader"""
+    from simulation_engine import SimulationEngine
+    
+    engine = SimulationEngine()
+    loader = engine.data_loader
+    price_stats = loader.get_price_statistics(PLAN["crop"])
+    
+    def yield_estimate():
+        engine.yield_estimator.estimate_yield(
+            PLAN["crop"], PLAN["soil_type"], PLAN["seed_quality"], PLAN["expected_rainfall"],
+            PLAN["rainfall_delay"], PLAN["irrigation_frequency"], PLAN["fertilizer_mix"],
+            PLAN["pest_probability"], PLAN["area_hectares"]
+        )
+    
+    def cultivation_cost():
+        engine.cost_calculator.calculate_cultivation_cost(
+            PLAN["crop"], PLAN["area_hectares"], PLAN["seed_quantity_kg"], PLAN["fertilizer_mix"],
+            PLAN["irrigation_frequency"], PLAN["expected_rainfall"], PLAN["labour_days"],
+            PLAN["pest_control_intensity"], 80.0
+        )
+    
+    def risk_score():
+        engine.risk_engine.calculate_risk_score(
+            PLAN["crop"], PLAN["soil_type"], PLAN["expected_rainfall"], PLAN["rainfall_delay"],
+            PLAN["pest_probability"], price_stats, 0.8
+        )
+    
+    def price_statistics_uncached():
+        loader.price_stats_cache.clear()
+        loader._commodity_matches.clear()
+        loader.get_price_statistics(PLAN["crop"])
+    
+    return {
+        "micro.estimate_yield": Case(yield_estimate, number=200),
+        "micro.calculate_cultivation_cost": Case(cultivation_cost, number=200),
+        "micro.calculate_risk_score": Case(risk_score, number=200),
+        "micro.forecast_prices": Case(
+            lambda: engine.price_forecaster.forecast_prices(PLAN["crop"], 2100.0, 60, seed=7), number=50
+        ),
+        "micro.forecast_prices_ensemble_1000": Case(
+            lambda: engine.price_forecaster.forecast_prices(PLAN["crop"], 2100.0, 60, 1000, seed=7)
+        ),
+        "micro.loader_crop_yield": Case(lambda: loader.get_crop_yield(PLAN["crop"]), number=200),
+        "micro.loader_price_arrays": Case(lambda: loader.get_commodity_price_arrays(PLAN["crop"], 180), number=200),
+        "micro.loader_price_statistics": Case(lambda: loader.get_price_statistics(PLAN["crop"]), number=200),
+        "micro.loader_price_statistics_uncached": Case(price_statistics_uncached, number=20),
+        "macro.whatif_100": Case(lambda: engine.run_whatif_simulation(PLAN, 100, 7)),
+        "macro.whatif_500": Case(lambda: engine.run_whatif_simulation(PLAN, 500, 7)),
+        "macro.whatif_2000": Case(lambda: engine.run_whatif_simulation(PLAN, 2000, 7))
+    }
+
+def endpoint_cases(client, response_cache) -> Dict[str, Case]:
+    """
+    Requests through the ASGI app (no network); the response cache is cleared
+    before every request so the full handler runs
+    """
+    request = {"farming_input": PLAN, "num_simulations": 500, "seed": 7}
+    
+    def post(path: str, body: Dict):
+        def run():
+            response_cache.clear()
+            response = client.post(path, json=body)
+            response.raise_for_status()
+        return run
+    
+    def get(path: str):
+        return lambda: client.get(path).raise_for_status()
+    
+    return {
+        "endpoint.crops": Case(get("/crops"), number=20),
+        "endpoint.simulate": Case(post("/simulate", request), number=5),
+        "endpoint.compare_scenarios": Case(post("/compare_scenarios", request)),
+        "endpoint.recommend": Case(post("/recommend", request)),
+        "endpoint.forecast_prices": Case(
+            post("/forecast_prices", {"commodity": "Rice", "current_price": 2100, "forecast_days": 60}), number=5
+        ),
+        "endpoint.sensitivity": Case(post("/sensitivity", {"farming_input": PLAN, "seed": 7}))
+    }
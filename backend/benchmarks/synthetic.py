@@ -0,0 +1,53 @@
+"""Synthetic crop yield and mandi price CSVs with the schema of the real datasets"""
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+COMMODITIES = [
+    "Rice", "Wheat", "Maize", "Cotton", "Onion", "Tomato", "Potato", "Soyabean",
+    "Arhar (Tur/Red Gram)(Whole)", "Broken Rice", "Bengal Gram(Gram)(Whole)", "Groundnut"
+]
+STATES = ["Punjab", "Bihar", "Kerala", "Maharashtra", "Uttar Pradesh", "Karnataka"]
+SEASONS = ["Kharif", "Rabi", "Total"]
+YEARS = range(2010, 2020)
+
+def write_crop_yields(path: Path, crops, seed: int = 0):
+    """One row per crop and season with Area/Production/Yield columns for each year"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for crop in crops:
+        for season in SEASONS:
+            row = {"Crop": crop, "Season": season}
+            for year in YEARS:
+                label = f"{year}-{str(year + 1)[2:]}"
+                row[f"Area-{label}"] = rng.uniform(100, 200)
+                row[f"Production-{label}"] = rng.uniform(100, 200)
+                row[f"Yield-{label}"] = 1000 + 30 * (year - YEARS[0]) + rng.uniform(0, 300)
+            rows.append(row)
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+def write_mandi_prices(path: Path, rows: int, seed: int = 0, chunk_rows: int = 500000):
+    """rows arrivals spread over two years of dates, written in chunks to bound memory"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2023-01-01", periods=730).strftime("%d/%m/%Y").to_numpy()
+    # A commodity's prices follow its own level with day-to-day noise
+    levels = dict(zip(COMMODITIES, rng.uniform(1500, 6000, len(COMMODITIES))))
+    
+    with open(path, "w", newline="") as handle:
+        for start in range(0, rows, chunk_rows):
+            size = min(chunk_rows, rows - start)
+            commodity = rng.choice(COMMODITIES, size)
+            modal = np.array([levels[name] for name in commodity]) * rng.lognormal(0, 0.1, size)
+            chunk = pd.DataFrame({
+                "State": rng.choice(STATES, size),
+                "District": "District",
+                "Market": np.char.add("Market ", rng.integers(0, 200, size).astype(str)),
+                "Commodity": commodity,
+                "Variety": "Other",
+                "Grade": "FAQ",
+                "Arrival_Date": rng.choice(dates, size),
+                "Min_x0020_Price": np.round(modal * 0.9),
+                "Max_x0020_Price": np.round(modal * 1.1),
+                "Modal_x0020_Price": np.round(modal)
+            })
+            chunk.to_csv(handle, index=False, header=start == 0)
@@ -4,9 +4,17 @@ from pathlib import Path
 
 # Base directories
 BASE_DIR = Path(__file__).resolve().parent
-DATA_DIR = BASE_DIR.parent / "datasets"
+DATA_DIR = Path(os.getenv("DATA_DIR", str(BASE_DIR.parent / "datasets")))
 MODELS_DIR = BASE_DIR / "models"
 
+# Dataset files
+CROP_YIELD_FILE = DATA_DIR / "All-India_-Crop-wise-Area,-Production-&-Yield.csv"
+MANDI_PRICE_FILE = DATA_DIR / "9ef84268-d588-465a-a308-a864a43d0070.csv"
+
+# Typed columnar snapshots of the parsed datasets (rebuilt whenever a source CSV changes)
+DATASET_SNAPSHOTS = os.getenv("DATASET_SNAPSHOTS", "1") != "0"
+SNAPSHOT_DIR = Path(os.getenv("DATASET_SNAPSHOT_DIR", str(DATA_DIR / ".snapshots")))
+
 # API Configuration
 API_KEY = os.getenv("API_KEY", "579b464db66ec23bdd0000019e4dba64f69842d1547080c5536593c7")
 
@@ -32,6 +40,35 @@ CROP_SOIL_COMPATIBILITY = {
     "Sugarcane": {"Alluvial": 0.9, "Black": 0.85, "Red": 0.7, "Laterite": 0.6, "Desert": 0.3, "Mountain": 0.5, "Clay": 0.8, "Sandy": 0.4},
 }
 
+# Compatibility of each soil for crops without a row above (yield model)
+DEFAULT_SOIL_COMPATIBILITY = {
+    "Alluvial": 0.8, "Black": 0.75, "Red": 0.7,
+    "Laterite": 0.6, "Desert": 0.4, "Mountain": 0.6,
+    "Clay": 0.75, "Sandy": 0.5
+}
+
+# Compatibility assumed for soils missing from both tables
+FALLBACK_SOIL_COMPATIBILITY = 0.7
+
+# Optimal rainfall ranges by crop type (mm)
+OPTIMAL_RAINFALL_RANGES = {
+    "Rice": (1000, 1500),
+    "Wheat": (400, 600),
+    "Maize": (600, 900),
+    "Cotton": (600, 1000),
+    "Sugarcane": (1200, 1800),
+}
+DEFAULT_RAINFALL_RANGE = (500, 800)
+
+# Optimal NPK ranges (kg/hectare)
+OPTIMAL_NPK = {
+    "Rice": (80, 40, 40),
+    "Wheat": (120, 60, 40),
+    "Maize": (100, 50, 50),
+    "Cotton": (100, 50, 50),
+}
+DEFAULT_NPK = (80, 40, 40)
+
 # Default crop parameters (kg/hectare for yield)
 DEFAULT_YIELDS = {
     "Rice": 2899, "Wheat": 3587, "Maize": 3518, "Barley": 3049,
@@ -41,6 +78,23 @@ DEFAULT_YIELDS = {
     "Soybean": 1200, "Sunflower": 800, "Potato": 22000,
     "Onion": 18000, "Tomato": 25000
 }
+# Base yield of crops without an entry above
+FALLBACK_YIELD = 2000
+
+# Base yields from the crop yield time series: a linear trend per crop and season, projected
+# to the current crop year but at most max_horizon_years past the last observation
+YIELD_TREND = {
+    "min_years": 4,  # shorter series use their most recent yield
+    "max_horizon_years": int(os.getenv("YIELD_TREND_HORIZON_YEARS", "3")),
+    "max_change": 0.25,  # projections stay within the observed range widened by 25%
+    "projection_year": int(os.getenv("YIELD_PROJECTION_YEAR", "0")),  # 0 = current year
+}
+
+# Alternate spellings used for crops in the AGMARKNET commodity names
+COMMODITY_ALIASES = {
+    "Soybean": ["Soyabean"],
+    "Urad": ["Urd"],
+}
 
 # Fertilizer types and their NPK ratios
 FERTILIZERS = {
@@ -69,6 +123,9 @@ RISK_WEIGHTS = {
     "soil_mismatch": 0.20,
 }
 
+# Seed used when a request does not supply one (keeps results reproducible)
+DEFAULT_SEED = 42
+
 # Simulation parameters
 SIMULATION_PARAMS = {
     "num_simulations": 500,  # Default number of micro-simulations
@@ -77,3 +134,86 @@ SIMULATION_PARAMS = {
     "pest_prob_range": (0, 0.30),  # 0-30%
     "fertilizer_variance": 0.15,  # ±15%
 }
+
+# Streaming ingestion of the mandi price file
+PRICE_INGEST = {
+    "chunk_rows": int(os.getenv("PRICE_INGEST_CHUNK_ROWS", "200000")),
+    # Most recent rows kept per commodity (0 = all, as a full read); the engines read at most 180
+    "history_rows": int(os.getenv("PRICE_HISTORY_ROWS", "0")),
+    # Arrival_Date format; AGMARKNET exports are day first
+    "date_format": os.getenv("PRICE_DATE_FORMAT", "%d/%m/%Y"),
+}
+
+# Seconds between checks of the mandi price file for appended rows (0 = never)
+PRICE_WATCH_INTERVAL = float(os.getenv("PRICE_WATCH_INTERVAL", "0"))
+
+# Cache sizes (entries) for memoized price statistics and trend/volatility
+PRICE_CACHE_SIZE = int(os.getenv("PRICE_CACHE_SIZE", "256"))
+
+# Ensemble price forecasts
+FORECAST_ENSEMBLE = {
+    "max_paths": 10000,
+    "chunk_paths": 1024,  # Paths generated per batch; bounds peak memory
+    "histogram_bins": 1024,  # Per-day bins used for percentile bands
+}
+
+# Execution backend for CPU-bound simulation work ("thread" or "process")
+EXECUTOR = {
+    "backend": os.getenv("EXECUTOR_BACKEND", "thread"),
+    "max_workers": int(os.getenv("EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    "max_pending": int(os.getenv("EXECUTOR_MAX_PENDING", "32")),
+}
+
+# Large (sharded) Monte Carlo runs
+MONTE_CARLO = {
+    "max_simulations": 500000,
+    "default_shards": 8,  # Fixed so results for a given seed don't depend on core count
+    "block_size": 65536,  # Draws evaluated per vectorized block within a shard
+    "shard_workers": int(os.getenv("MONTE_CARLO_WORKERS", str(os.cpu_count() or 1))),
+}
+
+# Batch simulation (/simulate_batch)
+BATCH_MAX_RECORDS = int(os.getenv("BATCH_MAX_RECORDS", "50000"))
+
+# Plan optimizer (AI optimal plan and /optimize)
+OPTIMIZER = {
+    "scenarios": 128,  # common random-number scenarios every candidate is scored on
+    "cvar_alpha": 0.1,  # CVaR over the worst 10% of scenarios
+    "risk_aversion": 0.5,  # λ in mean - λ·CVaR
+    "time_budget_ms": float(os.getenv("OPTIMIZER_TIME_BUDGET_MS", "250")),  # /optimize only
+    "max_candidates": int(os.getenv("OPTIMIZER_MAX_CANDIDATES", "8192")),  # deterministic search budget
+    "batch_size": 1024,
+    "refine_rounds": 3,
+    "refine_top_k": 8,
+    "pareto_points": 25,
+}
+
+# Sensitivity / tornado analysis (/sensitivity)
+SENSITIVITY = {
+    "points": 5,  # grid points per input, spread evenly over its span
+    "relative_span": 0.2,  # ±20% for quantities (area, rainfall, labour, price, fertilizer, seed)
+    # Inputs on a fixed scale (or often zero) move by an absolute amount instead
+    "absolute_spans": {
+        "seed_quality": 0.1,
+        "pest_probability": 0.1,
+        "pest_control_intensity": 0.2,
+        "rainfall_delay": 10,
+        "irrigation_frequency": 2,
+        "sale_month": 2,
+    },
+}
+
+# Response cache for deterministic endpoints (/simulate, /compare_scenarios, /recommend)
+RESPONSE_CACHE = {
+    "ttl_seconds": float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+    "max_entries": int(os.getenv("RESPONSE_CACHE_ENTRIES", "1024")),
+    "max_bytes": int(os.getenv("RESPONSE_CACHE_BYTES", str(64 * 1024 * 1024))),
+    # Optional SQLite file shared by all workers on the host (disabled when empty)
+    "sqlite_path": os.getenv("RESPONSE_CACHE_DB", ""),
+}
+
+# Prometheus /metrics: share of requests and engine calls whose pipeline stages are timed
+# (request counts and latencies are always recorded; 0 turns stage timing off)
+METRICS = {
+    "sample_rate": float(os.getenv("METRICS_SAMPLE_RATE", "0.1")),
+}
@@ -1,6 +1,22 @@
 """Cultivation cost calculation engine"""
-from typing import Dict
+import numpy as np
+from typing import Dict, Optional
 import config
+from batch_inputs import (
+    FERTILIZER_COSTS, BatchInputs, FertilizerInput, batch_column, batch_fertilizer, fertilizer_quantities
+)
+from reference import REFERENCE, NameInput
+
+# Standard per-hectare costs (INR)
+LAND_PREPARATION_PER_HECTARE = 3500
+HARVESTING_PER_HECTARE = 4000
+
+# Irrigation is 30% cheaper above 800 mm of rainfall
+HIGH_RAINFALL_MM = 800
+HIGH_RAINFALL_IRRIGATION_FACTOR = 0.7
+
+# Miscellaneous costs as a share of direct costs
+MISCELLANEOUS_SHARE = 0.10
 
 class CostCalculator:
     """Calculate total cost of cultivation"""
@@ -28,23 +44,21 @@ class CostCalculator:
         fertilizer_cost = self._calculate_fertilizer_cost(fertilizer_mix, area_hectares)
         
         # Irrigation cost
-        irrigation_cost = self._calculate_irrigation_cost(
-            irrigation_frequency, area_hectares, expected_rainfall
-        )
+        irrigation_cost = self._calculate_irrigation_cost(irrigation_frequency, area_hectares)
+        if expected_rainfall > HIGH_RAINFALL_MM:
+            irrigation_cost *= HIGH_RAINFALL_IRRIGATION_FACTOR
         
         # Labour cost
         labour_cost = self._calculate_labour_cost(labour_days)
         
         # Pesticide cost
-        pesticide_cost = self._calculate_pesticide_cost(
-            area_hectares, pest_control_intensity
-        )
+        pesticide_cost = self._calculate_pesticide_cost(area_hectares, pest_control_intensity)
         
         # Land preparation cost (standard)
-        land_prep_cost = area_hectares * 3500
+        land_prep_cost = area_hectares * LAND_PREPARATION_PER_HECTARE
         
         # Harvesting cost
-        harvesting_cost = area_hectares * 4000
+        harvesting_cost = area_hectares * HARVESTING_PER_HECTARE
         
         # Market fees and logistics
         market_fees = total_production_quintals * 50 * config.COST_PARAMS["market_fee_percent"] / 100
@@ -52,15 +66,13 @@ class CostCalculator:
         
         # Miscellaneous (10% of direct costs)
         direct_costs = (
-            seed_cost + fertilizer_cost + irrigation_cost + 
+            seed_cost + fertilizer_cost + irrigation_cost +
             labour_cost + pesticide_cost + land_prep_cost + harvesting_cost
         )
-        miscellaneous = direct_costs * 0.10
+        miscellaneous = direct_costs * MISCELLANEOUS_SHARE
         
         # Total cost
-        total_cost = (
-            direct_costs + market_fees + logistics_cost + miscellaneous
-        )
+        total_cost = direct_costs + market_fees + logistics_cost + miscellaneous
         
         # Cost per quintal
         cost_per_quintal = total_cost / total_production_quintals if total_production_quintals > 0 else 0
@@ -83,37 +95,99 @@ class CostCalculator:
             }
         }
     
-    def _calculate_seed_cost(self, crop: str, quantity_kg: float) -> float:
-        """Calculate seed cost"""
-        cost_per_kg = config.COST_PARAMS["seed_cost_per_kg"].get(
-            crop, 
-            config.COST_PARAMS["seed_cost_per_kg"]["default"]
+    def calculate_cost_batch(
+        self,
+        crop: NameInput,
+        inputs: BatchInputs,
+        total_production_quintals,
+        fertilizer_mix: Optional[FertilizerInput] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Array-native cost model for batch, Monte Carlo and optimizer runs
+        inputs holds area_hectares, irrigation_frequency, expected_rainfall and
+        optionally seed_quantity_kg (area * 50), labour_days (30),
+        pest_control_intensity (0.5) and fertilizer_scale (1.0); fertilizer_mix
+        is as for YieldEstimator.estimate_yield_batch.
+        Returns unrounded arrays: every breakdown component of calculate_cultivation_cost plus total_cost
+        """
+        if fertilizer_mix is None:
+            fertilizer_mix = batch_fertilizer(inputs)
+        area = batch_column(inputs, "area_hectares")
+        
+        # Seed cost
+        seed_cost = self._calculate_seed_cost(crop, batch_column(inputs, "seed_quantity_kg", area * 50))
+        
+        # Fertilizer cost (one matmul over the quantity matrix)
+        quantities, _ = fertilizer_quantities(fertilizer_mix)
+        fertilizer_cost = (quantities @ FERTILIZER_COSTS) * area * batch_column(inputs, "fertilizer_scale", 1.0)
+        
+        # Irrigation cost
+        irrigation_cost = self._calculate_irrigation_cost(batch_column(inputs, "irrigation_frequency"), area)
+        irrigation_cost = irrigation_cost * np.where(
+            batch_column(inputs, "expected_rainfall") > HIGH_RAINFALL_MM, HIGH_RAINFALL_IRRIGATION_FACTOR, 1.0
         )
+        
+        # Labour cost
+        labour_cost = self._calculate_labour_cost(batch_column(inputs, "labour_days", 30))
+        
+        # Pesticide cost
+        pesticide_cost = self._calculate_pesticide_cost(area, batch_column(inputs, "pest_control_intensity", 0.5))
+        
+        # Land preparation cost (standard)
+        land_prep_cost = area * LAND_PREPARATION_PER_HECTARE
+        
+        # Harvesting cost
+        harvesting_cost = area * HARVESTING_PER_HECTARE
+        
+        # Market fees and logistics
+        production = np.asarray(total_production_quintals, dtype=float)
+        market_fees = production * 50 * config.COST_PARAMS["market_fee_percent"] / 100
+        logistics_cost = production * config.COST_PARAMS["logistics_cost_per_quintal"]
+        
+        # Miscellaneous (10% of direct costs)
+        direct_costs = (
+            seed_cost + fertilizer_cost + irrigation_cost +
+            labour_cost + pesticide_cost + land_prep_cost + harvesting_cost
+        )
+        miscellaneous = direct_costs * MISCELLANEOUS_SHARE
+        
+        return {
+            "seed_cost": seed_cost,
+            "fertilizer_cost": fertilizer_cost,
+            "irrigation_cost": irrigation_cost,
+            "labour_cost": labour_cost,
+            "pesticide_cost": pesticide_cost,
+            "land_preparation": land_prep_cost,
+            "harvesting_cost": harvesting_cost,
+            "market_fees": market_fees,
+            "logistics_cost": logistics_cost,
+            "miscellaneous": miscellaneous,
+            "total_cost": direct_costs + market_fees + logistics_cost + miscellaneous
+        }
+    
+    def _calculate_seed_cost(self, crop: NameInput, quantity_kg: float) -> float:
+        """Calculate seed cost"""
+        crop_id = REFERENCE.crop_index(crop)
+        cost_per_kg = REFERENCE.scalar.seed_cost[crop_id] if isinstance(crop, str) else REFERENCE.seed_cost[crop_id]
         return quantity_kg * cost_per_kg
     
     def _calculate_fertilizer_cost(self, fertilizer_mix: Dict[str, float], area: float) -> float:
         """Calculate total fertilizer cost"""
         total_cost = 0
         for fertilizer, qty_per_hectare in fertilizer_mix.items():
-            if fertilizer in config.FERTILIZERS:
-                cost_per_kg = config.FERTILIZERS[fertilizer]["cost_per_kg"]
-                total_cost += qty_per_hectare * area * cost_per_kg
+            fertilizer_id = REFERENCE.fertilizer_ids.get(fertilizer)
+            if fertilizer_id is not None:
+                total_cost += qty_per_hectare * area * REFERENCE.scalar.fertilizer_cost[fertilizer_id]
         return total_cost
     
-    def _calculate_irrigation_cost(self, frequency: int, area: float, rainfall: float) -> float:
-        """Calculate irrigation costs"""
+    def _calculate_irrigation_cost(self, frequency, area):
+        """Irrigation costs before the high-rainfall discount"""
         # Assume each irrigation provides 50mm water equivalent
         water_per_irrigation = 50
         total_water_mm = frequency * water_per_irrigation
         
         # Cost per mm per hectare
-        cost = total_water_mm * area * config.COST_PARAMS["irrigation_cost_per_mm"]
-        
-        # Reduce cost if rainfall is high
-        if rainfall > 800:
-            cost *= 0.7
-        
-        return cost
+        return total_water_mm * area * config.COST_PARAMS["irrigation_cost_per_mm"]
     
     def _calculate_labour_cost(self, labour_days: float) -> float:
         """Calculate labour costs"""
@@ -1,117 +1,504 @@
 """Data loading and preprocessing module"""
+import hashlib
+import io
+import threading
+import time
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 import config
+import metrics
+from cache import LRUCache
+from pandas.api.types import union_categoricals
+from price_ingest import PriceIngester, ingest_price_file, newest_first_key, read_price_chunks
+from reference import REFERENCE
+from snapshot import load_snapshot, write_snapshot
+from yield_cube import YieldCube
+
+class CommodityPrices(NamedTuple):
+    """Price history of a commodity as contiguous arrays, newest arrival first"""
+    dates: np.ndarray  # datetime64[ns], NaT last
+    modal: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    rows: np.ndarray  # positions into DataLoader.price_data
+    
+    def head(self, n: int) -> "CommodityPrices":
+        """First n (most recent) entries"""
+        return CommodityPrices(*(arr[:n] for arr in self))
+
+_EMPTY_PRICES = CommodityPrices(
+    dates=np.array([], dtype='datetime64[ns]'),
+    modal=np.array([]),
+    minimum=np.array([]),
+    maximum=np.array([]),
+    rows=np.array([], dtype=np.intp),
+)
+
+class _CommodityMatch(NamedTuple):
+    """Memoized resolution of a commodity query against the price index"""
+    version: int  # dataset version the entry was built at
+    generation: int  # dataset version at which the matched commodities last changed
+    patterns: Tuple[str, ...]  # lowercased query and aliases, matched as substrings
+    prices: CommodityPrices
+
+_PRICE_COLUMNS = {
+    "modal": "Modal_x0020_Price",
+    "minimum": "Min_x0020_Price",
+    "maximum": "Max_x0020_Price",
+}
+
+def _concat_price_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Stack price frames, merging the categories of their text columns"""
+    columns = {}
+    for name in frames[0].columns:
+        parts = [frame[name] for frame in frames]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[name] = union_categoricals(parts, ignore_order=True)
+        else:
+            columns[name] = np.concatenate([part.to_numpy() for part in parts])
+    return pd.DataFrame(columns)
 
 class DataLoader:
-    """Load and preprocess agricultural datasets"""
+    """
+    Load and preprocess agricultural datasets
+    One instance is shared by every engine in the process (see get_data_loader);
+    the loaded frames are treated as read-only and only replaced wholesale by
+    reload(), or extended by new price arrivals (append_prices, refresh_prices)
+    """
     
     def __init__(self):
         self.crop_data = None
         self.price_data = None
+        self.yield_cube: Optional[YieldCube] = None
+        self.version = 0
+        self.fingerprint = ""
+        self._price_index: Dict[str, CommodityPrices] = {}
+        # Commodity query -> match; entries of an older dataset version are ignored
+        self._commodity_matches: Dict[str, _CommodityMatch] = {}
+        # (version of the last full load, commodity name -> version of the append that last changed it)
+        self._price_generations: Tuple[int, Dict[str, int]] = (0, {})
+        # Appended price rows not yet folded into price_data, and the rows/bytes ingested so far
+        self._price_appends: List[pd.DataFrame] = []
+        self._price_rows = 0
+        self._price_offset = 0
+        self._price_file_id: Optional[tuple] = None
+        self._watcher: Optional[threading.Thread] = None
+        self.price_stats_cache = LRUCache(config.PRICE_CACHE_SIZE)
+        # Caches derived from the datasets, cleared whenever they are reloaded; appends
+        # leave them alone, as their price keys carry price_generation() instead
+        self._dependent_caches: List[LRUCache] = [self.price_stats_cache]
+        self._reload_lock = threading.Lock()
         self.load_datasets()
     
     def load_datasets(self):
-        """Load all available datasets"""
-        try:
-            # Load crop yield data
-            crop_file = config.DATA_DIR / "All-India_-Crop-wise-Area,-Production-&-Yield.csv"
-            if crop_file.exists():
-                self.crop_data = pd.read_csv(crop_file)
-                self._preprocess_crop_data()
-            
-            # Load market price data
-            price_file = config.DATA_DIR / "9ef84268-d588-465a-a308-a864a43d0070.csv"
-            if price_file.exists():
-                self.price_data = pd.read_csv(price_file)
-                self._preprocess_price_data()
+        """Load all available datasets (from snapshots when they are current)"""
+        crop_data = None
+        price_data = None
+        price_index = {}
+        yield_cube = None
+        # Loads are rare and slow, so their stages are always timed
+        with metrics.operation(always=True):
+            try:
+                # Load crop yield data
+                crop_data = self._load_dataset(
+                    config.CROP_YIELD_FILE, "crop_yield",
+                    lambda source: self._preprocess_crop_data(pd.read_csv(source))
+                )
                 
-        except Exception as e:
-            print(f"Error loading datasets: {e}")
+                # Load market price data (streamed in chunks; rows come out in index order)
+                price_data = self._load_dataset(
+                    config.MANDI_PRICE_FILE, "mandi_prices",
+                    lambda source: ingest_price_file(source, **config.PRICE_INGEST),
+                    options=config.PRICE_INGEST
+                )
+            
+            except Exception as e:
+                print(f"Error loading datasets: {e}")
+            
+            if crop_data is not None:
+                with metrics.stage("dataset.yield_cube"):
+                    yield_cube = YieldCube(crop_data, **config.YIELD_TREND)
+            if price_data is not None:
+                with metrics.stage("dataset.price_index"):
+                    price_index = self._build_price_index(price_data)
+        
+        # Swap in the new frames together so readers never see a half-loaded state
+        self.crop_data, self.price_data, self.yield_cube = crop_data, price_data, yield_cube
+        self._price_index, self._commodity_matches = price_index, {}
+        self._price_generations = (self.version + 1, {})
+        self._price_appends = []
+        self._price_rows = len(price_data) if price_data is not None else 0
+        self._price_offset = price_data.attrs.get("source_length", 0) if price_data is not None else 0
+        self._price_file_id = self._file_id(config.MANDI_PRICE_FILE)
+        self.fingerprint = self._source_fingerprint()
+        self.version += 1
+        for cache in self._dependent_caches:
+            cache.clear()
     
-    def _preprocess_crop_data(self):
-        """Clean and prepare crop yield data"""
-        if self.crop_data is not None:
-            # Remove empty strings and convert to numeric
-            numeric_cols = [col for col in self.crop_data.columns if 'Yield' in col or 'Production' in col or 'Area' in col]
-            for col in numeric_cols:
-                self.crop_data[col] = pd.to_numeric(self.crop_data[col], errors='coerce')
-    
-    def _preprocess_price_data(self):
-        """Clean and prepare market price data"""
-        if self.price_data is not None:
-            # Convert price columns to numeric
-            price_cols = ['Min_x0020_Price', 'Max_x0020_Price', 'Modal_x0020_Price']
-            for col in price_cols:
-                if col in self.price_data.columns:
-                    self.price_data[col] = pd.to_numeric(self.price_data[col], errors='coerce')
+    def _load_dataset(
+        self,
+        source: Path,
+        name: str,
+        parse: Callable[[Path], pd.DataFrame],
+        options: Optional[Dict] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Parsed dataset from its snapshot if current, otherwise from the CSV
+        (writing a fresh snapshot for the next boot)
+        """
+        if not source.exists():
+            return None
+        
+        directory = config.SNAPSHOT_DIR / name
+        if config.DATASET_SNAPSHOTS:
+            with metrics.stage(f"dataset.{name}.snapshot"):
+                snapshot = load_snapshot(directory, source, options)
+            if snapshot is not None:
+                return snapshot.frame
+        
+        with metrics.stage(f"dataset.{name}.csv"):
+            frame = parse(source)
+        # A file that grew while it was parsed is snapshotted on a later boot
+        length = frame.attrs.get("source_length")
+        if config.DATASET_SNAPSHOTS and (length is None or length == source.stat().st_size):
+            try:
+                write_snapshot(directory, source, frame, options)
+            except OSError as e:
+                # A read-only disk or a concurrent writer only costs the next boot a CSV parse
+                print(f"Could not write {name} snapshot: {e}")
+        return frame
+    
+    def register_cache(self, cache: LRUCache):
+        """Clear the given cache whenever the datasets are reloaded"""
+        self._dependent_caches.append(cache)
+    
+    def _source_fingerprint(self) -> str:
+        """Identify the loaded data by its source files, consistently across worker processes"""
+        parts = []
+        for path in (config.CROP_YIELD_FILE, config.MANDI_PRICE_FILE):
+            if path.exists():
+                stat = path.stat()
+                parts.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+    
+    def reload(self) -> int:
+        """Re-read the datasets from disk and return the new dataset version"""
+        with self._reload_lock:
+            self.load_datasets()
+            return self.version
+    
+    @staticmethod
+    def _file_id(path: Path) -> Optional[tuple]:
+        """(device, inode) of path, to notice a file replaced rather than appended to"""
+        if not path.exists():
+            return None
+        stat = path.stat()
+        return (stat.st_dev, stat.st_ino)
+    
+    def append_prices(self, rows: pd.DataFrame) -> int:
+        """
+        Add new price arrivals (columns as in the mandi CSV) without a reload
+        Only the commodities present in rows are re-indexed; returns the new dataset version
+        """
+        with self._reload_lock:
+            new = self._parse_price_rows([rows])
+            digest = hashlib.sha256(pd.util.hash_pandas_object(new, index=False).to_numpy().tobytes()).hexdigest()
+            self._append_price_frame(new, hashlib.sha256(f"{self.fingerprint}:{digest}".encode()).hexdigest()[:16])
+            return self.version
+    
+    def refresh_prices(self) -> bool:
+        """
+        Ingest the rows appended to the mandi price file since it was last read
+        A file that shrank or was replaced is reloaded in full. Returns whether the data changed
+        """
+        source = config.MANDI_PRICE_FILE
+        with self._reload_lock:
+            if not source.exists():
+                return False
+            stat = source.stat()
+            if stat.st_size == self._price_offset and self._file_id(source) == self._price_file_id:
+                return False
+            
+            with open(source, "rb") as handle:
+                header = handle.readline()
+                replaced = (
+                    self._file_id(source) != self._price_file_id
+                    or stat.st_size < self._price_offset
+                    or self._price_offset < len(header)
+                )
+                if not replaced:
+                    handle.seek(self._price_offset)
+                    tail = handle.read(stat.st_size - self._price_offset)
             
-            # Parse date
-            if 'Arrival_Date' in self.price_data.columns:
-                self.price_data['Arrival_Date'] = pd.to_datetime(self.price_data['Arrival_Date'], errors='coerce')
+            if replaced:
+                self.load_datasets()
+                return True
+            
+            # Stop after the last complete row; a writer may be in the middle of one
+            tail = tail[:tail.rfind(b"\n") + 1]
+            if not tail:
+                return False
+            new = self._parse_price_rows(
+                read_price_chunks(io.BytesIO(header + tail), config.PRICE_INGEST["chunk_rows"])
+            )
+            self._price_offset += len(tail)
+            self._append_price_frame(new, self._source_fingerprint())
+            return True
     
-    def get_crop_yield(self, crop: str, season: str = "Total") -> float:
-        """Get average yield for a crop"""
-        if self.crop_data is None:
-            return config.DEFAULT_YIELDS.get(crop, 2000)
+    def watch_prices(self, interval: float):
+        """Call refresh_prices every interval seconds from a background thread"""
+        if self._watcher is not None:
+            return
         
-        crop_rows = self.crop_data[
-            (self.crop_data['Crop'] == crop) & 
-            (self.crop_data['Season'] == season)
+        def poll():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh_prices()
+                except Exception as e:
+                    print(f"Error refreshing prices: {e}")
+        
+        self._watcher = threading.Thread(target=poll, name="price-watcher", daemon=True)
+        self._watcher.start()
+    
+    def _parse_price_rows(self, chunks) -> pd.DataFrame:
+        """Typed frame (in index order) of new raw price rows"""
+        ingester = PriceIngester(config.PRICE_INGEST["history_rows"], config.PRICE_INGEST["date_format"])
+        for chunk in chunks:
+            ingester.add_chunk(chunk)
+        ingester.report("Appended price rows")
+        return ingester.frame()
+    
+    def _append_price_frame(self, new: pd.DataFrame, fingerprint: str):
+        """
+        Merge new rows into the price index, touching only their commodities:
+        O(new rows + retained history) per commodity instead of a full reload
+        """
+        index = dict(self._price_index)
+        history_rows = config.PRICE_INGEST["history_rows"]
+        touched = self._build_price_index(new)
+        for commodity, prices in touched.items():
+            # Positions continue after the rows already loaded (see _price_frame)
+            prices = prices._replace(rows=prices.rows + self._price_rows)
+            existing = index.get(commodity)
+            if existing is not None:
+                merged = CommodityPrices(*(np.concatenate(arrays) for arrays in zip(existing, prices)))
+                # Newest first; on equal dates earlier rows (lower positions) stay first
+                order = np.lexsort((merged.rows, newest_first_key(merged.dates)))
+                if history_rows:
+                    order = order[:history_rows]
+                prices = CommodityPrices(*(arr[order] for arr in merged))
+            index[commodity] = prices
+        
+        self._price_appends.append(new)
+        self._price_rows += len(new)
+        # Rows trimmed from the index are dropped from price_data too, once they make up half of it
+        retained = sum(len(prices.rows) for prices in index.values())
+        compacted = history_rows and self._price_rows > 2 * retained
+        if compacted:
+            index = self._compact_price_rows(index)
+        
+        # Only queries matching a touched commodity see new prices: they get a new generation,
+        # while the memo entries (unless rows were renumbered) and cached statistics of the rest stay valid
+        version = self.version + 1
+        base, changed = self._price_generations
+        changed = {**changed, **dict.fromkeys(touched, version)}
+        names = [name.lower() for name in touched]
+        matches = {} if compacted else {
+            key: entry._replace(version=version)
+            for key, entry in self._commodity_matches.items()
+            if entry.version == self.version
+            and not any(pattern in name for pattern in entry.patterns for name in names)
+        }
+        # Readers take the generations before the index (see _commodity_match)
+        self._price_index = index
+        self._price_generations = (base, changed)
+        self._commodity_matches = matches
+        self.fingerprint = fingerprint
+        self.version = version
+    
+    def _price_frame(self) -> Optional[pd.DataFrame]:
+        """
+        price_data with appended rows folded in (row positions as in CommodityPrices.rows)
+        Call with _reload_lock held
+        """
+        if self._price_appends:
+            frames = ([self.price_data] if self.price_data is not None else []) + self._price_appends
+            self.price_data = _concat_price_frames(frames)
+            self._price_appends = []
+        return self.price_data
+    
+    def _compact_price_rows(self, index: Dict[str, CommodityPrices]) -> Dict[str, CommodityPrices]:
+        """
+        Keep only the price rows index refers to, in their current order, and
+        return index with its row positions renumbered to match
+        """
+        frame = self._price_frame()
+        retained = np.sort(np.concatenate([prices.rows for prices in index.values()]))
+        self.price_data = frame.iloc[retained].reset_index(drop=True)
+        self._price_rows = len(retained)
+        return {
+            commodity: prices._replace(rows=np.searchsorted(retained, prices.rows))
+            for commodity, prices in index.items()
+        }
+    
+    def _preprocess_crop_data(self, crop_data: pd.DataFrame) -> pd.DataFrame:
+        """Clean and prepare crop yield data"""
+        # Remove empty strings and convert to numeric
+        numeric_cols = [col for col in crop_data.columns if 'Yield' in col or 'Production' in col or 'Area' in col]
+        for col in numeric_cols:
+            crop_data[col] = pd.to_numeric(crop_data[col], errors='coerce')
+        return crop_data
+    
+    def _build_price_index(self, price_data: pd.DataFrame) -> Dict[str, CommodityPrices]:
+        """Group price rows by commodity, each sorted by arrival date (newest first)"""
+        if 'Commodity' not in price_data.columns:
+            return {}
+        
+        codes, commodities = pd.factorize(price_data['Commodity'])
+        if 'Arrival_Date' in price_data.columns:
+            dates = price_data['Arrival_Date'].to_numpy(dtype='datetime64[ns]')
+        else:
+            dates = np.full(len(price_data), np.datetime64('NaT'), dtype='datetime64[ns]')
+        
+        # Contiguous by commodity, newest first within each commodity
+        order = np.lexsort((newest_first_key(dates), codes))
+        order = order[codes[order] >= 0]
+        
+        # Rows stored in index order (see ingest_price_file) are sliced rather than
+        # gathered, so snapshot-backed arrays stay views of the shared memory map
+        if len(order) and np.array_equal(order, np.arange(order[0], order[0] + len(order))):
+            take = slice(order[0], order[0] + len(order))
+        else:
+            take = order
+        
+        columns = {
+            name: (
+                price_data[col].to_numpy()[take] if col in price_data.columns
+                else np.full(len(order), np.nan)
+            )
+            for name, col in _PRICE_COLUMNS.items()
+        }
+        sorted_dates = dates[take]
+        bounds = np.searchsorted(codes[order], np.arange(len(commodities) + 1))
+        
+        index = {}
+        for code, commodity in enumerate(commodities):
+            block = slice(bounds[code], bounds[code + 1])
+            index[str(commodity)] = CommodityPrices(
+                dates=sorted_dates[block],
+                modal=columns["modal"][block],
+                minimum=columns["minimum"][block],
+                maximum=columns["maximum"][block],
+                rows=order[block],
+            )
+        return index
+    
+    def _match_commodity(self, commodity: str) -> CommodityPrices:
+        """Resolve a (case-insensitive, alias-aware) commodity query against the price index"""
+        return self._commodity_match(commodity).prices
+    
+    def price_generation(self, commodity: str) -> int:
+        """
+        Dataset version at which the prices matching a commodity query last changed
+        Caches of per-commodity price results key on it, so appends to other commodities keep them
+        """
+        return self._commodity_match(commodity).generation
+    
+    def _commodity_match(self, commodity: str) -> _CommodityMatch:
+        key = commodity.lower()
+        # The version is read before the index: the loader swaps the index in before
+        # bumping the version, so an entry is never built from an older index than its tag.
+        # Likewise the generations are read before the index, so a generation never
+        # claims newer prices than the ones it was computed alongside
+        version = self.version
+        matches = self._commodity_matches
+        entry = matches.get(key)
+        if entry is not None and entry.version == version:
+            return entry
+        base, changed = self._price_generations
+        price_index = self._price_index
+        
+        aliases = next(
+            (names for crop, names in config.COMMODITY_ALIASES.items() if crop.lower() == key), []
+        )
+        patterns = (key,) + tuple(alias.lower() for alias in aliases)
+        names = [
+            name for name in price_index
+            if any(pattern in name.lower() for pattern in patterns)
         ]
+        entries = [price_index[name] for name in names]
+        generation = max((changed.get(name, base) for name in names), default=base)
         
-        if len(crop_rows) > 0:
-            # Get most recent yield
-            yield_cols = [col for col in crop_rows.columns if 'Yield' in col]
-            if yield_cols:
-                recent_yield = crop_rows[yield_cols[-1]].values[0]
-                if pd.notna(recent_yield):
-                    return float(recent_yield)
+        if len(entries) == 1:
+            matched = entries[0]
+        elif entries:
+            merged = CommodityPrices(*(np.concatenate(arrays) for arrays in zip(*entries)))
+            order = np.argsort(newest_first_key(merged.dates), kind='stable')
+            matched = CommodityPrices(*(arr[order] for arr in merged))
+        else:
+            matched = _EMPTY_PRICES
         
-        return config.DEFAULT_YIELDS.get(crop, 2000)
+        # Queries come from user input, so keep the memo bounded
+        if len(matches) >= 512:
+            matches = self._commodity_matches = {}
+        entry = matches[key] = _CommodityMatch(version, generation, patterns, matched)
+        return entry
+    
+    def get_crop_yield(self, crop: str, season: str = "Total") -> float:
+        """
+        Base yield for a crop: the trend of its yield series projected to the current
+        year (see YieldCube), else the default yield from config
+        """
+        base_yield = self.yield_cube.get_base_yield(crop, season) if self.yield_cube is not None else None
+        if base_yield is not None:
+            return base_yield
+        return REFERENCE.scalar.default_yield[REFERENCE.crop_index(crop)]
     
     def get_commodity_prices(self, commodity: str, days: int = 60) -> pd.DataFrame:
         """Get recent price data for a commodity"""
-        if self.price_data is None:
-            return pd.DataFrame()
-        
-        commodity_data = self.price_data[
-            self.price_data['Commodity'].str.contains(commodity, case=False, na=False)
-        ].copy()
-        
-        if len(commodity_data) > 0:
-            commodity_data = commodity_data.sort_values('Arrival_Date', ascending=False)
-            return commodity_data.head(days)
+        # Under the lock, so the row positions match the frame (appends may compact it)
+        with self._reload_lock:
+            price_data = self._price_frame()
+            if price_data is None:
+                return pd.DataFrame()
+            prices = self.get_commodity_price_arrays(commodity, days)
+        if len(prices.rows) > 0:
+            return price_data.iloc[prices.rows]
         
         return pd.DataFrame()
     
+    def get_commodity_price_arrays(self, commodity: str, days: int = 60) -> CommodityPrices:
+        """
+        Get the most recent price arrays for a commodity (O(1) after the first lookup)
+        Prices are stored as float32 and widened to float64 for the caller's arithmetic
+        """
+        prices = self._match_commodity(commodity).head(days)
+        return prices._replace(
+            modal=prices.modal.astype(float), minimum=prices.minimum.astype(float), maximum=prices.maximum.astype(float)
+        )
+    
     def get_historical_yield_trend(self, crop: str) -> Dict:
         """Get historical yield trends for forecasting"""
-        if self.crop_data is None:
-            return {}
-        
-        crop_rows = self.crop_data[self.crop_data['Crop'] == crop]
-        if len(crop_rows) == 0:
+        if self.yield_cube is None:
             return {}
-        
-        yield_cols = [col for col in crop_rows.columns if 'Yield' in col]
-        trends = {}
-        
-        for col in yield_cols:
-            year = col.split('-')[-1] if '-' in col else col
-            values = crop_rows[col].values
-            if len(values) > 0 and pd.notna(values[0]):
-                trends[year] = float(values[0])
-        
-        return trends
+        return self.yield_cube.yield_history(crop)
     
-    def get_price_statistics(self, commodity: str) -> Dict:
-        """Get price statistics for risk calculation"""
-        prices = self.get_commodity_prices(commodity, days=180)
+    def get_price_statistics(self, commodity: str, window: int = 180) -> Dict:
+        """Get price statistics for risk calculation (memoized per commodity and window)"""
+        key = (commodity.lower(), window, self.price_generation(commodity))
+        stats = self.price_stats_cache.get_or_compute(
+            key, lambda: self._compute_price_statistics(commodity, window)
+        )
+        return dict(stats)
+    
+    def _compute_price_statistics(self, commodity: str, window: int) -> Dict:
+        """Mean/std/min/max/volatility of the most recent modal prices"""
+        prices = self.get_commodity_price_arrays(commodity, days=window)
         
-        if len(prices) == 0:
+        if len(prices.rows) == 0:
             return {
                 "mean": 2000,
                 "std": 500,
@@ -120,12 +507,32 @@ class DataLoader:
                 "volatility": 0.25
             }
         
-        modal_prices = prices['Modal_x0020_Price'].dropna()
+        modal_prices = prices.modal[~np.isnan(prices.modal)]
+        if len(modal_prices) == 0:
+            return {"mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan, "volatility": 0.25}
+        
+        mean = float(modal_prices.mean())
+        std = float(modal_prices.std(ddof=1)) if len(modal_prices) > 1 else np.nan
         
         return {
-            "mean": float(modal_prices.mean()),
-            "std": float(modal_prices.std()),
+            "mean": mean,
+            "std": std,
             "min": float(modal_prices.min()),
             "max": float(modal_prices.max()),
-            "volatility": float(modal_prices.std() / modal_prices.mean()) if modal_prices.mean() > 0 else 0.25
+            "volatility": std / mean if mean > 0 else 0.25
         }
+
+
+_shared_loader: Optional[DataLoader] = None
+_shared_loader_lock = threading.Lock()
+
+def get_data_loader() -> DataLoader:
+    """Return the process-wide DataLoader, loading the datasets on first use"""
+    global _shared_loader
+    if _shared_loader is None:
+        with _shared_loader_lock:
+            if _shared_loader is None:
+                _shared_loader = DataLoader()
+                if config.PRICE_WATCH_INTERVAL > 0:
+                    _shared_loader.watch_prices(config.PRICE_WATCH_INTERVAL)
+    return _shared_loader
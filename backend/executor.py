@@ -0,0 +1,183 @@
+"""Execution backends that keep CPU-bound simulation work off the asyncio event loop"""
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import metrics
+
+# Engines used by call_engine in this process; process-pool workers build their own
+_engines: Dict[str, Any] = {}
+_engines_lock = threading.Lock()
+
+def install_engines(**engines):
+    """Register already constructed engines (thread backend, or the main process)"""
+    _engines.update(engines)
+
+def _init_worker_engines():
+    """Process-pool initializer: construct the engines once per worker process"""
+    from simulation_engine import SimulationEngine
+    simulation_engine = SimulationEngine()
+    install_engines(
+        simulation=simulation_engine,
+        forecaster=simulation_engine.price_forecaster
+    )
+
+def _init_shard_worker():
+    """Shard-pool initializer: build the Monte Carlo shard engine once per worker process"""
+    from simulation_engine import init_shard_engine
+    init_shard_engine()
+
+def _process_context():
+    """
+    Start method of the worker pools: forkserver (spawn where unavailable), never fork
+    Pools are created lazily, possibly while the warm-up thread holds a lock, and a
+    forked child would inherit that lock held and deadlock on it
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+def get_engine(engine: str) -> Any:
+    """Registered engine, constructing the engines (and loading the datasets) on first use"""
+    if engine not in _engines:
+        with _engines_lock:
+            if engine not in _engines:
+                _init_worker_engines()
+    return _engines[engine]
+
+def call_engine(engine: str, method: str, *args, **kwargs) -> Any:
+    """Invoke a method on a registered engine (picklable entry point for worker processes)"""
+    with metrics.operation():
+        return getattr(get_engine(engine), method)(*args, **kwargs)
+
+def call_engine_with_stages(engine: str, method: str, *args, **kwargs) -> Any:
+    """call_engine for process workers: also hands back the stage timings recorded in the worker"""
+    result = call_engine(engine, method, *args, **kwargs)
+    return result, metrics.STAGE_SECONDS.drain()
+
+class QueueFullError(Exception):
+    """Raised when the executor already holds its maximum number of pending jobs"""
+
+class SimulationExecutor:
+    """
+    Run engine calls on a thread or process pool and await the result
+    At most max_workers jobs run at once; further jobs wait in a queue of at
+    most max_pending admitted jobs, beyond which submissions are rejected
+    """
+    
+    def __init__(
+        self,
+        backend: str = "thread",
+        max_workers: int = 4,
+        max_pending: int = 32,
+        shard_workers: int = 1
+    ):
+        if backend not in ("thread", "process"):
+            raise ValueError(f"Unknown executor backend: {backend}")
+        self.backend = backend
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.shard_workers = shard_workers
+        self._pool: Optional[Executor] = None
+        self._shard_pool: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        
+        # Metrics (only touched from the event loop thread)
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+    
+    def _get_pool(self) -> Executor:
+        """Create the worker pool on first use"""
+        if self._pool is None:
+            if self.backend == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=_process_context(),
+                    initializer=_init_worker_engines
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="simulation"
+                )
+        return self._pool
+    
+    def _get_shard_pool(self) -> ProcessPoolExecutor:
+        """Create the process pool used for sharded Monte Carlo runs on first use"""
+        if self._shard_pool is None:
+            self._shard_pool = ProcessPoolExecutor(
+                max_workers=self.shard_workers, mp_context=_process_context(),
+                initializer=_init_shard_worker
+            )
+        return self._shard_pool
+    
+    async def run(self, engine: str, method: str, *args, **kwargs) -> Any:
+        """Run engine.method(*args, **kwargs) in the pool without blocking the event loop"""
+        if self.backend == "process":
+            call = functools.partial(call_engine_with_stages, engine, method, *args, **kwargs)
+            result, stages = await self._admit(lambda loop: loop.run_in_executor(self._get_pool(), call))
+            metrics.STAGE_SECONDS.merge(stages)
+            return result
+        call = functools.partial(call_engine, engine, method, *args, **kwargs)
+        return await self._admit(lambda loop: loop.run_in_executor(self._get_pool(), call))
+    
+    async def map_shards(self, fn: Callable, arg_lists: Sequence[tuple]) -> List[Any]:
+        """
+        Run fn(*args) for every shard on the shard process pool
+        The whole map counts as one job against the concurrency limits
+        """
+        def launch(loop):
+            pool = self._get_shard_pool()
+            return asyncio.gather(*(loop.run_in_executor(pool, fn, *args) for args in arg_lists))
+        return await self._admit(launch)
+    
+    async def _admit(self, launch: Callable) -> Any:
+        """Apply the pending/concurrency limits around an awaitable created by launch(loop)"""
+        if self.queued + self.in_flight >= self.max_pending:
+            self.rejected += 1
+            raise QueueFullError(f"{self.queued + self.in_flight} simulation jobs already pending")
+        
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        
+        self.in_flight += 1
+        try:
+            result = await launch(asyncio.get_running_loop())
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+    
+    def stats(self) -> Dict:
+        """Queue depth and throughput counters"""
+        return {
+            "backend": self.backend,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "shard_workers": self.shard_workers,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected
+        }
+    
+    def shutdown(self):
+        """Stop the worker pools"""
+        for pool in (self._pool, self._shard_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._shard_pool = None
@@ -1,23 +1,31 @@
 """FastAPI main application for KrishiSaarthi"""
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, File, Header, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional
-import uvicorn
-
-from simulation_engine import SimulationEngine
-from price_forecaster import PriceForecaster
-from yield_estimator import YieldEstimator
-from cost_calculator import CostCalculator
-from risk_engine import RiskEngine
-from data_loader import DataLoader
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import TYPE_CHECKING, Dict, Iterator, List, Literal, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+import asyncio
+import io
+import json
+
+from executor import QueueFullError, SimulationExecutor, get_engine
+from metrics import MetricsMiddleware
+from payloads import FastJSONResponse, StaticPayload, dumps_json, shape
+import metrics
+from response_cache import ResponseCache
 import config
 
+if TYPE_CHECKING:
+    from simulation_engine import SimulationEngine
+
 # Initialize FastAPI app
 app = FastAPI(
     title="KrishiSaarthi - AI Farm Decision Simulator",
     description="AI-powered farming decision support system for Indian farmers",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -29,13 +37,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize engines
-simulation_engine = SimulationEngine()
-price_forecaster = PriceForecaster()
-yield_estimator = YieldEstimator()
-cost_calculator = CostCalculator()
-risk_engine = RiskEngine()
-data_loader = DataLoader()
+# Request counts and latencies per route for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Simulation work runs on a worker pool so heavy requests don't block the event loop
+executor = SimulationExecutor(
+    shard_workers=config.MONTE_CARLO["shard_workers"], **config.EXECUTOR
+)
+
+# Seeded requests are deterministic, so identical payloads can reuse the serialized response
+response_cache = ResponseCache(**config.RESPONSE_CACHE)
+
+# The engines (numpy/pandas and the datasets) are built off the event loop after startup,
+# so the worker answers /health and the static endpoints while they load
+_warm_up: Optional[Future] = None
+
+def warm_up() -> Future:
+    """Start building the engines in the background (once); resolves to the simulation engine"""
+    global _warm_up
+    if _warm_up is None:
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="warm-up")
+        _warm_up = pool.submit(get_engine, "simulation")
+        pool.shutdown(wait=False)
+    return _warm_up
+
+async def simulation_engine() -> "SimulationEngine":
+    """The simulation engine, waiting for the warm-up if it is still running"""
+    return await asyncio.shield(asyncio.wrap_future(warm_up()))
+
+@app.on_event("startup")
+async def start_warm_up():
+    warm_up()
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    executor.shutdown()
 
 # Pydantic models for request/response
 class FarmingInput(BaseModel):
@@ -57,11 +93,147 @@ class FarmingInput(BaseModel):
 class SimulationRequest(BaseModel):
     farming_input: FarmingInput
     num_simulations: int = Field(500, ge=100, le=2000, description="Number of micro-simulations")
+    seed: Optional[int] = Field(None, ge=0, description="Random seed (default from config); echoed in the response")
+
+class BatchSimulationRequest(BaseModel):
+    records: List[FarmingInput] = Field(
+        ..., min_length=1, max_length=config.BATCH_MAX_RECORDS, description="One farming plan per plot"
+    )
+    seed: Optional[int] = Field(None, ge=0, description="Random seed (default from config)")
+
+class MonteCarloRequest(BaseModel):
+    farming_input: FarmingInput
+    num_simulations: int = Field(
+        50000, ge=1000, le=config.MONTE_CARLO["max_simulations"], description="Number of Monte Carlo draws"
+    )
+    num_shards: Optional[int] = Field(None, ge=1, le=64, description="Independent RNG shards (default from config)")
+    seed: Optional[int] = Field(None, ge=0, description="Root seed; results are reproducible for a given seed and shard count")
+
+class OptimizeRequest(BaseModel):
+    farming_input: FarmingInput
+    objective: Literal["risk_adjusted", "expected_profit"] = Field(
+        "risk_adjusted", description="Maximize mean - λ·CVaR of profit, or expected profit alone"
+    )
+    risk_aversion: Optional[float] = Field(None, ge=0, le=5, description="λ weight on CVaR (default from config)")
+    budget: Optional[float] = Field(None, gt=0, description="Maximum expected total cost (INR)")
+    time_budget_ms: Optional[float] = Field(None, ge=10, le=5000, description="Search time limit (default from config)")
+    seed: Optional[int] = Field(None, ge=0, description="Random seed (default from config); echoed in the response")
+
+class SensitivityRequest(BaseModel):
+    farming_input: FarmingInput
+    points: Optional[int] = Field(None, ge=3, le=21, description="Grid points per input (default from config)")
+    seed: Optional[int] = Field(None, ge=0, description="Random seed (default from config); echoed in the response")
 
 class PriceForecastRequest(BaseModel):
     commodity: str
     current_price: float
     forecast_days: int = Field(60, ge=1, le=180)
+    ensemble_paths: int = Field(
+        0, ge=0, le=config.FORECAST_ENSEMBLE["max_paths"],
+        description="Simulate this many paths and return P10/P50/P90 bands (0 = single path)"
+    )
+    seed: Optional[int] = Field(None, ge=0, description="Random seed (default from config); echoed in the response")
+
+def resolve_seed(seed: Optional[int]) -> int:
+    """Seed actually used for a request (echoed back so results can be reproduced)"""
+    return config.DEFAULT_SEED if seed is None else seed
+
+async def response_cache_key(
+    endpoint: str,
+    params: Dict,
+    seed: int,
+    num_simulations: Optional[int] = None,
+    fields: Optional[str] = None,
+    compact: bool = False
+) -> str:
+    """
+    Cache key over the validated inputs, the requested view, the identity of the loaded
+    datasets and today's date (price forecasts are dated from the day they are made)
+    """
+    payload = {
+        "farming_input": params,
+        "seed": seed,
+        "num_simulations": num_simulations,
+        "date": date.today().isoformat()
+    }
+    if fields or compact:
+        payload["view"] = {"fields": fields, "compact": compact}
+    engine = await simulation_engine()
+    return ResponseCache.make_key(endpoint, payload, engine.data_loader.fingerprint)
+
+async def cached_response(key: str) -> Optional[Response]:
+    """Cached response for key; a failing cache counts as a miss"""
+    try:
+        body = response_cache.get(key)
+        if body is None:
+            # The SQLite tier blocks, so it runs off the event loop
+            body = await asyncio.to_thread(response_cache.get_disk, key)
+    except Exception as e:
+        print(f"Response cache lookup failed: {e}")
+        return None
+    if body is None:
+        return None
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "HIT"})
+
+async def store_response(key: str, content: Dict) -> Response:
+    """Serialize content and cache it; a failing cache does not fail the request"""
+    with metrics.stage("response.encode"):
+        body = dumps_json(content)
+    try:
+        expires_at = response_cache.put(key, body)
+        await asyncio.to_thread(response_cache.put_disk, key, body, expires_at)
+    except Exception as e:
+        print(f"Response cache write failed: {e}")
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "MISS"})
+
+def parse_batch_upload(content: bytes, filename: str) -> List[Dict]:
+    """
+    Read FarmingInput rows from an uploaded CSV or Parquet file
+    Fertilizer quantities come from fertilizer_<Name> columns (e.g. fertilizer_Urea);
+    rows that fail validation are returned as {"error": ...}
+    """
+    import pandas as pd
+    
+    if filename.lower().endswith(".parquet"):
+        frame = pd.read_parquet(io.BytesIO(content))
+    else:
+        frame = pd.read_csv(io.BytesIO(content))
+    
+    fertilizer_cols = [col for col in frame.columns if col.startswith("fertilizer_")]
+    records = []
+    for row in frame.to_dict(orient="records"):
+        fields = {
+            key: value for key, value in row.items()
+            if key not in fertilizer_cols and not pd.isna(value)
+        }
+        fields["fertilizer_mix"] = {
+            col[len("fertilizer_"):]: float(row[col]) for col in fertilizer_cols
+            if not pd.isna(row[col]) and row[col] > 0
+        }
+        try:
+            records.append(FarmingInput(**fields).dict())
+        except ValidationError as e:
+            records.append({"error": str(e)})
+    return records
+
+def ndjson_lines(rows: List[Dict], chunk_size: int = 500) -> Iterator[str]:
+    """Serialize rows as newline-delimited JSON, a chunk of lines at a time"""
+    for start in range(0, len(rows), chunk_size):
+        yield "".join(json.dumps(row) + "\n" for row in rows[start:start + chunk_size])
+
+async def run_batch(records: List[Dict], seed: Optional[int]) -> StreamingResponse:
+    """Simulate valid records on the executor and stream all rows back as NDJSON"""
+    valid = [i for i, record in enumerate(records) if "error" not in record]
+    errors = [{"index": i, "error": record["error"]} for i, record in enumerate(records) if "error" in record]
+    
+    results = await executor.run(
+        "simulation", "simulate_batch", [records[i] for i in valid], resolve_seed(seed)
+    )
+    # Map positions within the valid subset back to the caller's record numbers
+    for result in results:
+        result["index"] = valid[result["index"]]
+    
+    return StreamingResponse(ndjson_lines(results + errors), media_type="application/x-ndjson")
 
 # API Endpoints
 
@@ -71,26 +243,37 @@ async def root():
     return {
         "message": "KrishiSaarthi - AI Farm Decision Simulator API",
         "version": "1.0.0",
-        "endpoints": ["/simulate", "/forecast_prices", "/compare_scenarios", "/recommend", "/crops", "/soils"]
+        "endpoints": ["/simulate", "/simulate_batch", "/forecast_prices", "/compare_scenarios", "/optimize", "/sensitivity", "/monte_carlo", "/recommend", "/crops", "/soils", "/stats", "/metrics", "/health", "/ready"]
     }
 
+# Reference lists never change while the process runs: encoded and compressed once, served with ETags
+STATIC_PAYLOADS = {
+    "crops": StaticPayload({"crops": config.CROPS}),
+    "soils": StaticPayload({"soil_types": config.SOIL_TYPES}),
+    "fertilizers": StaticPayload({"fertilizers": config.FERTILIZERS})
+}
+
 @app.get("/crops")
-async def get_crops():
+async def get_crops(if_none_match: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None)):
     """Get list of supported crops"""
-    return {"crops": config.CROPS}
+    return STATIC_PAYLOADS["crops"].response(if_none_match, accept_encoding)
 
 @app.get("/soils")
-async def get_soil_types():
+async def get_soil_types(if_none_match: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None)):
     """Get list of soil types"""
-    return {"soil_types": config.SOIL_TYPES}
+    return STATIC_PAYLOADS["soils"].response(if_none_match, accept_encoding)
 
 @app.get("/fertilizers")
-async def get_fertilizers():
+async def get_fertilizers(if_none_match: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None)):
     """Get fertilizer information"""
-    return {"fertilizers": config.FERTILIZERS}
+    return STATIC_PAYLOADS["fertilizers"].response(if_none_match, accept_encoding)
 
 @app.post("/simulate")
-async def simulate_farming(request: SimulationRequest):
+async def simulate_farming(
+    request: SimulationRequest,
+    fields: Optional[str] = Query(None, description="Comma-separated dotted paths of data to return, e.g. current_plan.profit"),
+    compact: bool = Query(False, description="Send shared price forecasts once and drop repeated inputs")
+):
     """
     Run comprehensive farming simulation
     Returns yield estimation, cost analysis, risk assessment, and profitability
@@ -102,17 +285,74 @@ async def simulate_farming(request: SimulationRequest):
         if params["seed_quantity_kg"] is None:
             params["seed_quantity_kg"] = params["area_hectares"] * 50
         
+        # Same forecast stream as the current plan of /compare_scenarios for this seed
+        seed = resolve_seed(request.seed)
+        key = await response_cache_key("simulate", params, seed, fields=fields, compact=compact)
+        cached = await cached_response(key)
+        if cached is not None:
+            return cached
+        from simulation_engine import request_seed_sequences
+        forecast_seed, _ = request_seed_sequences(seed)
+        
         # Run simulation
-        result = simulation_engine._simulate_scenario(params, "current")
+        result = await executor.run("simulation", "_simulate_scenario", params, "current", forecast_seed)
         
-        return {
+        return await store_response(key, {
             "success": True,
-            "data": result
-        }
+            "seed": seed,
+            "data": shape(result, fields, compact)
+        })
+    
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Simulation error: {str(e)}")
 
+@app.post("/simulate_batch")
+async def simulate_batch(request: BatchSimulationRequest):
+    """
+    Simulate many farm plans in one request (e.g. all plots of a cooperative)
+    Streams one JSON object per plan (NDJSON), tagged with its position in "index"
+    """
+    try:
+        return await run_batch([record.dict() for record in request.records], request.seed)
+    
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch simulation error: {str(e)}")
+
+@app.post("/simulate_batch/upload")
+async def simulate_batch_upload(
+    file: UploadFile = File(...),
+    seed: Optional[int] = Query(None, ge=0, description="Random seed (default from config)")
+):
+    """
+    Batch simulation from an uploaded CSV or Parquet file (one FarmingInput per row)
+    Invalid rows are reported in the stream as {"index", "error"}
+    """
+    try:
+        content = await file.read()
+        records = await asyncio.to_thread(parse_batch_upload, content, file.filename or "")
+    except ImportError as e:
+        raise HTTPException(status_code=400, detail=f"Parquet upload needs pyarrow installed: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not read upload: {str(e)}")
+    
+    if not records or len(records) > config.BATCH_MAX_RECORDS:
+        raise HTTPException(status_code=400, detail=f"Upload must contain 1-{config.BATCH_MAX_RECORDS} rows")
+    
+    try:
+        return await run_batch(records, seed)
+    
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch simulation error: {str(e)}")
+
 @app.post("/forecast_prices")
 async def forecast_commodity_prices(request: PriceForecastRequest):
     """
@@ -120,22 +360,34 @@ async def forecast_commodity_prices(request: PriceForecastRequest):
     Returns price predictions and optimal selling window
     """
     try:
-        forecast = price_forecaster.forecast_prices(
+        seed = resolve_seed(request.seed)
+        forecast = await executor.run(
+            "forecaster", "forecast_prices",
             request.commodity,
             request.current_price,
-            request.forecast_days
+            request.forecast_days,
+            request.ensemble_paths,
+            seed
         )
         
         return {
             "success": True,
+            "seed": seed,
             "data": forecast
         }
     
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Forecast error: {str(e)}")
 
 @app.post("/compare_scenarios")
-async def compare_scenarios(request: SimulationRequest):
+async def compare_scenarios(
+    request: SimulationRequest,
+    fields: Optional[str] = Query(None, description="Comma-separated dotted paths of data to return, e.g. current_plan.profit"),
+    compact: bool = Query(False, description="Send shared price forecasts once and drop repeated inputs")
+):
     """
     Compare Current Plan vs AI Optimal Plan vs Worst Case
     Returns detailed comparison with What-If analysis
@@ -146,22 +398,135 @@ async def compare_scenarios(request: SimulationRequest):
         if params["seed_quantity_kg"] is None:
             params["seed_quantity_kg"] = params["area_hectares"] * 50
         
+        seed = resolve_seed(request.seed)
+        key = await response_cache_key("compare_scenarios", params, seed, request.num_simulations, fields, compact)
+        cached = await cached_response(key)
+        if cached is not None:
+            return cached
+        
         # Run What-If simulation
-        results = simulation_engine.run_whatif_simulation(
+        results = await executor.run(
+            "simulation", "run_whatif_simulation",
             params,
-            request.num_simulations
+            request.num_simulations,
+            seed
+        )
+        
+        return await store_response(key, {
+            "success": True,
+            "seed": seed,
+            "data": shape(results, fields, compact)
+        })
+    
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Comparison error: {str(e)}")
+
+@app.post("/optimize")
+async def optimize_plan(request: OptimizeRequest):
+    """
+    Search seed quality, irrigation, fertilizer, pest control and sale month
+    Returns the best plan under the budget and the Pareto front of profit vs risk
+    """
+    try:
+        params = request.farming_input.dict()
+        
+        if params["seed_quantity_kg"] is None:
+            params["seed_quantity_kg"] = params["area_hectares"] * 50
+        
+        seed = resolve_seed(request.seed)
+        result = await executor.run(
+            "simulation", "optimize_plan", params, seed,
+            request.objective, request.risk_aversion, request.budget, request.time_budget_ms
         )
         
         return {
             "success": True,
-            "data": results
+            "seed": seed,
+            "data": result
         }
     
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Comparison error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Optimization error: {str(e)}")
+
+@app.post("/sensitivity")
+async def sensitivity_analysis(request: SensitivityRequest):
+    """
+    Which input matters most: profit and risk over a grid of each input,
+    with elasticities and a tornado ranking by profit swing
+    """
+    try:
+        params = request.farming_input.dict()
+        
+        if params["seed_quantity_kg"] is None:
+            params["seed_quantity_kg"] = params["area_hectares"] * 50
+        
+        seed = resolve_seed(request.seed)
+        key = await response_cache_key("sensitivity", params, seed, request.points)
+        cached = await cached_response(key)
+        if cached is not None:
+            return cached
+        
+        result = await executor.run("simulation", "sensitivity_analysis", params, seed, request.points)
+        
+        return await store_response(key, {
+            "success": True,
+            "seed": seed,
+            "data": result
+        })
+    
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Sensitivity error: {str(e)}")
+
+@app.post("/monte_carlo")
+async def run_monte_carlo(request: MonteCarloRequest):
+    """
+    Large Monte Carlo study (up to 500k draws) sharded across worker processes
+    Returns the same summary statistics as the micro-simulations of /compare_scenarios
+    """
+    try:
+        params = request.farming_input.dict()
+        
+        if params["seed_quantity_kg"] is None:
+            params["seed_quantity_kg"] = params["area_hectares"] * 50
+        
+        from simulation_engine import plan_micro_shards, run_micro_shard, summarize_micro_shards
+        
+        seed = resolve_seed(request.seed)
+        shards = plan_micro_shards(request.num_simulations, seed, request.num_shards)
+        partials = await executor.map_shards(
+            run_micro_shard, [(params,) + shard for shard in shards]
+        )
+        
+        return {
+            "success": True,
+            "seed": seed,
+            "data": summarize_micro_shards(partials, seed)
+        }
+    
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Monte Carlo error: {str(e)}")
 
 @app.post("/recommend")
-async def get_recommendations(request: SimulationRequest):
+async def get_recommendations(
+    request: SimulationRequest,
+    fields: Optional[str] = Query(None, description="Comma-separated dotted paths of data to return, e.g. current_plan.profit"),
+    compact: bool = Query(False, description="Send shared price forecasts once and drop repeated inputs")
+):
     """
     Get AI-powered recommendations for optimal farming strategy
     Returns actionable insights and optimization suggestions
@@ -172,35 +537,98 @@ async def get_recommendations(request: SimulationRequest):
         if params["seed_quantity_kg"] is None:
             params["seed_quantity_kg"] = params["area_hectares"] * 50
         
-        # Run What-If simulation
-        results = simulation_engine.run_whatif_simulation(params, 300)
-        
-        # Extract key recommendations
-        recommendation_data = {
-            "recommendation_text": results["recommendation"],
-            "current_profit": results["current_plan"]["profit"],
-            "optimal_profit": results["ai_optimal_plan"]["profit"],
-            "profit_improvement": results["ai_optimal_plan"]["profit"] - results["current_plan"]["profit"],
-            "current_risk": results["current_plan"]["risk"]["overall_risk_score"],
-            "optimal_risk": results["ai_optimal_plan"]["risk"]["overall_risk_score"],
-            "risk_reduction": results["current_plan"]["risk"]["overall_risk_score"] - results["ai_optimal_plan"]["risk"]["overall_risk_score"],
-            "key_insights": results["ai_optimal_plan"]["risk"]["insights"],
-            "optimal_parameters": results["ai_optimal_plan"]["parameters_used"]
-        }
+        seed = resolve_seed(request.seed)
+        key = await response_cache_key("recommend", params, seed, fields=fields, compact=compact)
+        cached = await cached_response(key)
+        if cached is not None:
+            return cached
         
-        return {
+        # Only the current and optimal plans feed the recommendation
+        recommendation_data = await executor.run("simulation", "recommend", params, seed)
+        
+        return await store_response(key, {
             "success": True,
-            "data": recommendation_data
-        }
+            "seed": seed,
+            "data": shape(recommendation_data, fields, compact)
+        })
+    
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}")
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Recommendation error: {str(e)}")
 
+@app.get("/stats")
+async def get_stats():
+    """Runtime statistics (cache hit/miss counters, executor queue depth)"""
+    engine = await simulation_engine()
+    return {
+        "dataset_version": engine.data_loader.version,
+        "executor": executor.stats(),
+        "caches": {
+            "price_statistics": engine.data_loader.price_stats_cache.stats(),
+            "trend_volatility": engine.price_forecaster.trend_cache.stats(),
+            "responses": response_cache.stats()
+        }
+    }
+
+def runtime_metrics() -> List[str]:
+    """Executor, cache and dataset gauges, read at scrape time"""
+    stats = executor.stats()
+    families = [
+        metrics.format_family("krishi_executor_queued", "gauge", "Simulation jobs waiting for a worker", [({}, stats["queued"])]),
+        metrics.format_family("krishi_executor_in_flight", "gauge", "Simulation jobs running", [({}, stats["in_flight"])]),
+        metrics.format_family(
+            "krishi_executor_jobs_total", "counter", "Finished simulation jobs by outcome",
+            [({"outcome": outcome}, stats[outcome]) for outcome in ("completed", "failed", "rejected")]
+        )
+    ]
+    
+    responses = response_cache.stats()
+    caches = {"responses": {**responses, "hits": responses["hits"] + responses["disk_hits"]}}
+    task = warm_up()
+    if task.done() and task.exception() is None:
+        engine = task.result()
+        caches["price_statistics"] = engine.data_loader.price_stats_cache.stats()
+        caches["trend_volatility"] = engine.price_forecaster.trend_cache.stats()
+        families.append(metrics.format_family(
+            "krishi_dataset_version", "gauge", "Reloads and appends of the loaded datasets",
+            [({}, engine.data_loader.version)]
+        ))
+    for name, help_text in (("hits", "Cache hits"), ("misses", "Cache misses")):
+        families.append(metrics.format_family(
+            f"krishi_cache_{name}_total", "counter", help_text,
+            [({"cache": cache}, cache_stats[name]) for cache, cache_stats in caches.items()]
+        ))
+    families.append(metrics.format_family(
+        "krishi_cache_hit_ratio", "gauge", "Cache hits over lookups",
+        [({"cache": cache}, cache_stats["hit_ratio"]) for cache, cache_stats in caches.items()]
+    ))
+    return families
+
+metrics.register_collector(runtime_metrics)
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text format: request counts and latencies, sampled stage timings, queue and cache gauges"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Liveness: the process is up and serving (the datasets may still be loading)"""
     return {"status": "healthy", "service": "KrishiSaarthi API"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: engines built and datasets loaded (503 until the warm-up has finished)"""
+    task = warm_up()
+    if not task.done():
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    if task.exception() is not None:
+        return JSONResponse(status_code=503, content={"status": "failed", "error": str(task.exception())})
+    return {"status": "ready", "dataset_version": task.result().data_loader.version}
+
 # Run server
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,189 @@
+"""Latency histograms, counters and per-stage timers, exported in the Prometheus text format"""
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+import config
+
+# Upper bounds (seconds) of the latency buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (labels, value) pairs of one metric family
+Samples = List[Tuple[Dict[str, str], float]]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+def format_family(name: str, kind: str, help_text: str, samples: Samples) -> str:
+    """One metric family in the text exposition format"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines += [f"{name}{_format_labels(labels)} {value:g}" for labels, value in samples]
+    return "\n".join(lines)
+
+class Counter:
+    """Monotonic counter per label set"""
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+    
+    def render(self) -> str:
+        with self._lock:
+            samples = [(dict(zip(self.labelnames, labels)), value) for labels, value in sorted(self._values.items())]
+        return format_family(self.name, "counter", self.help_text, samples)
+
+class Histogram:
+    """
+    Latency histogram per label set (cumulative buckets, as Prometheus expects)
+    State can be drained and merged, so worker processes can report to the main process
+    """
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket..., count above the last bucket, sum]
+        self._series: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+    
+    def drain(self) -> Dict[Tuple, List[float]]:
+        """Take the observations recorded so far (leaving the histogram empty)"""
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+    
+    def merge(self, drained: Dict[Tuple, List[float]]):
+        """Add observations drained from another histogram with the same buckets"""
+        with self._lock:
+            for labels, counts in drained.items():
+                series = self._series.setdefault(labels, [0] * (len(self.buckets) + 2))
+                for position, count in enumerate(counts):
+                    series[position] += count
+    
+    def render(self) -> str:
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        samples: Samples = []
+        for labels, series in items:
+            named = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                samples.append(({**named, "le": "+Inf" if bound == float("inf") else f"{bound:g}"}, cumulative))
+            samples.append(({**named, "__suffix": "sum"}, series[-1]))
+            samples.append(({**named, "__suffix": "count"}, cumulative))
+        
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, value in samples:
+            suffix = labels.pop("__suffix", "bucket")
+            lines.append(f"{self.name}_{suffix}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines)
+
+REQUESTS = Counter("krishi_http_requests_total", "HTTP requests by method, route and status", ("method", "path", "status"))
+REQUEST_SECONDS = Histogram("krishi_http_request_duration_seconds", "HTTP request latency", ("method", "path"))
+STAGE_SECONDS = Histogram("krishi_stage_duration_seconds", "Latency of sampled pipeline stages", ("stage",))
+
+_METRICS = [REQUESTS, REQUEST_SECONDS, STAGE_SECONDS]
+_collectors: List[Callable[[], List[str]]] = []
+
+def register_collector(collector: Callable[[], List[str]]):
+    """Add a callable returning formatted families (see format_family) at scrape time"""
+    _collectors.append(collector)
+
+def render() -> str:
+    """All metrics in the Prometheus text format"""
+    parts = [metric.render() for metric in _METRICS]
+    for collector in _collectors:
+        parts.extend(collector())
+    return "\n".join(parts) + "\n"
+
+# Whether the operation running in this context (request, engine call) times its stages
+_sampled: ContextVar[bool] = ContextVar("metrics_sampled", default=False)
+
+@contextmanager
+def operation(always: bool = False) -> Iterator[None]:
+    """
+    Scope of one request or engine call; with probability METRICS sample_rate
+    (or always) the stage() timers inside it record into STAGE_SECONDS
+    """
+    rate = config.METRICS["sample_rate"]
+    token = _sampled.set(always or (rate > 0 and random.random() < rate))
+    try:
+        yield
+    finally:
+        _sampled.reset(token)
+
+class _StageTimer:
+    __slots__ = ("name", "start")
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+    
+    def __exit__(self, *exc_info):
+        STAGE_SECONDS.observe(time.perf_counter() - self.start, self.name)
+
+_NOT_SAMPLED = nullcontext()
+
+def stage(name: str):
+    """Timer for a stage of the current operation (a shared no-op unless it is sampled)"""
+    return _StageTimer(name) if _sampled.get() else _NOT_SAMPLED
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests and timing them per route template"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            with operation():
+                await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; unmatched paths share one label
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            REQUEST_SECONDS.observe(time.perf_counter() - start, scope["method"], path)
+            REQUESTS.inc(scope["method"], path, str(status))
@@ -0,0 +1,293 @@
+"""Search-based farm plan optimizer"""
+import itertools
+import math
+import time
+import numpy as np
+from typing import Dict, List, Optional
+import config
+from reference import REFERENCE
+
+# Decision variables, in the column order of a candidate matrix
+DECISIONS = ["seed_quality", "irrigation_frequency", "fertilizer_family", "fertilizer_scale",
+             "pest_control_intensity", "sale_month"]
+SEED, IRRIGATION, FAMILY, SCALE, CONTROL, MONTH = range(len(DECISIONS))
+
+# Best certified seed quality realistically available
+MAX_SEED_QUALITY = 0.95
+
+def balanced_fertilizer_mix(crop: str) -> Dict[str, float]:
+    """Urea/DAP/MOP quantities (kg/hectare) that supply the crop's target NPK exactly"""
+    n, p, k = REFERENCE.npk_target[REFERENCE.crop_index(crop)].tolist()
+    urea_n = REFERENCE.fertilizer_npk[REFERENCE.fertilizer_ids["Urea"]][0]
+    dap_n, dap_p, _ = REFERENCE.fertilizer_npk[REFERENCE.fertilizer_ids["DAP"]].tolist()
+    mop_k = REFERENCE.fertilizer_npk[REFERENCE.fertilizer_ids["MOP"]][2]
+    dap = p / dap_p
+    urea = float(max(0.0, n - dap * dap_n) / urea_n)
+    mop = float(k / mop_k)
+    return {"Urea": round(urea, 1), "DAP": round(dap, 1), "MOP": round(mop, 1)}
+
+class PlanOptimizer:
+    """
+    Search seed quality, irrigation, fertilizer, pest control and sale month
+    for the plan maximizing expected profit or mean - λ·CVaR of profit
+    Every candidate is scored on the same sampled weather/pest/price scenarios
+    (common random numbers), a batch of candidates at a time
+    """
+    
+    def __init__(self, engine):
+        self.yield_estimator = engine.yield_estimator
+        self.cost_calculator = engine.cost_calculator
+        self.risk_engine = engine.risk_engine
+    
+    def optimize(
+        self,
+        base_params: Dict,
+        context,
+        rng: np.random.Generator,
+        objective: str = "risk_adjusted",
+        risk_aversion: Optional[float] = None,
+        budget: Optional[float] = None,
+        time_budget_ms: Optional[float] = None
+    ) -> Dict:
+        """
+        Best plan, the profit/risk Pareto front and search diagnostics
+        budget caps the expected total cost. The search stops early (truncated) after
+        max_candidates candidates, or once time_budget_ms has elapsed if one is given;
+        without a time budget the result depends only on the inputs and rng
+        """
+        settings = config.OPTIMIZER
+        started = time.perf_counter()
+        deadline = started + time_budget_ms / 1000 if time_budget_ms is not None else math.inf
+        risk_aversion = settings["risk_aversion"] if risk_aversion is None else risk_aversion
+        if objective not in ("risk_adjusted", "expected_profit"):
+            raise ValueError(f"Unknown objective: {objective}")
+        
+        families = self._fertilizer_families(base_params)
+        scenarios = self._draw_scenarios(base_params, settings["scenarios"], rng)
+        price_path = np.asarray(context.price_forecast(base_params.get("current_market_price", 2000))["forecast_prices"])
+        
+        evaluated: List[Dict[str, np.ndarray]] = []
+        
+        def evaluate(candidates: np.ndarray) -> bool:
+            """Score candidates batch by batch; False once the candidate or time budget runs out"""
+            remaining = settings["max_candidates"] - sum(len(batch["candidates"]) for batch in evaluated)
+            complete = len(candidates) <= remaining
+            candidates = candidates[:max(0, remaining)]
+            for start in range(0, len(candidates), settings["batch_size"]):
+                if time.perf_counter() > deadline:
+                    return False
+                batch = candidates[start:start + settings["batch_size"]]
+                metrics = self._evaluate(base_params, context, families, scenarios, price_path, batch)
+                metrics["objective"] = metrics["mean_profit"] - (
+                    risk_aversion * metrics["cvar_loss"] if objective == "risk_adjusted" else 0
+                )
+                metrics["feasible"] = (
+                    metrics["mean_cost"] <= budget if budget is not None else np.ones(len(batch), dtype=bool)
+                )
+                evaluated.append(metrics)
+            return complete
+        
+        # Coarse grid in random order, so a truncated search still samples it evenly
+        grid = self._candidate_grid(base_params, len(families))
+        truncated = not evaluate(grid[rng.permutation(len(grid))])
+        
+        # Local refinement of the continuous decisions around the best candidates
+        steps = np.array([0.05, 0.1, 0.1])
+        for _ in range(settings["refine_rounds"]):
+            if truncated:
+                break
+            results = self._concatenate(evaluated)
+            score = np.where(results["feasible"], results["objective"], -np.inf)
+            top = results["candidates"][np.argsort(-score)[:settings["refine_top_k"]]]
+            truncated = not evaluate(self._neighbours(top, steps))
+            steps = steps / 2
+        
+        results = self._concatenate(evaluated)
+        feasible = results["feasible"]
+        if not feasible.any():
+            raise ValueError(f"No plan found with expected cost within the budget of ₹{budget:,.0f}")
+        best = int(np.argmax(np.where(feasible, results["objective"], -np.inf)))
+        
+        return {
+            "objective": objective,
+            "risk_aversion": risk_aversion,
+            "budget": budget,
+            "best_plan": self._plan_params(base_params, families, results["candidates"][best]),
+            "best_metrics": self._metrics_row(results, best),
+            "pareto_front": [
+                {
+                    "parameters": self._decisions(families, results["candidates"][i]),
+                    **self._metrics_row(results, i)
+                }
+                for i in self._pareto_front(results)
+            ],
+            "candidates_evaluated": int(len(results["objective"])),
+            "scenarios": settings["scenarios"],
+            "truncated": truncated,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+    
+    def _fertilizer_families(self, base_params: Dict) -> List[Dict[str, float]]:
+        """Candidate mixes, each searched over a range of application scales"""
+        balanced = balanced_fertilizer_mix(base_params["crop"])
+        base_mix = base_params["fertilizer_mix"]
+        return [base_mix, balanced] if base_mix and base_mix != balanced else [balanced]
+    
+    def _draw_scenarios(self, base_params: Dict, num_scenarios: int, rng: np.random.Generator) -> Dict:
+        """Weather, pest and price shocks shared by every candidate"""
+        return {
+            # Rainfall variation (±20%), as in the micro-simulations
+            "rainfall": base_params["expected_rainfall"] * (1 + rng.uniform(-0.2, 0.2, num_scenarios)),
+            # Pest pressure relative to the plan's residual pest probability
+            "pest_shock": rng.uniform(0.5, 1.5, num_scenarios),
+            # Price variation (±10%)
+            "price_scale": rng.uniform(0.9, 1.1, num_scenarios)
+        }
+    
+    def _candidate_grid(self, base_params: Dict, num_families: int) -> np.ndarray:
+        """Full factorial coarse grid, one candidate per row (columns as in DECISIONS)"""
+        base_quality = base_params["seed_quality"]
+        base_irrigation = base_params["irrigation_frequency"]
+        seed_quality = np.unique(np.linspace(base_quality, max(base_quality, MAX_SEED_QUALITY), 3))
+        irrigation = range(max(0, base_irrigation - 2), base_irrigation + 5)
+        scales = [0.6, 0.8, 1.0, 1.2, 1.4]
+        control = np.unique(np.append(np.linspace(0.2, 0.9, 5), base_params.get("pest_control_intensity", 0.5)))
+        # Sale days are capped at day 59, reached from month 4
+        months = range(5)
+        return np.array(
+            list(itertools.product(seed_quality, irrigation, range(num_families), scales, control, months)),
+            dtype=float
+        )
+    
+    def _neighbours(self, candidates: np.ndarray, steps: np.ndarray) -> np.ndarray:
+        """Every ±step combination of seed quality, fertilizer scale and pest control"""
+        offsets = np.array(list(itertools.product((-1, 0, 1), repeat=3))) * steps
+        moved = np.repeat(candidates, len(offsets), axis=0)
+        moved[:, [SEED, SCALE, CONTROL]] += np.tile(offsets, (len(candidates), 1))
+        # Seed quality stays within the grid's ceiling (or the farmer's own, if higher)
+        moved[:, SEED] = np.clip(moved[:, SEED], 0, max(MAX_SEED_QUALITY, candidates[:, SEED].max()))
+        moved[:, SCALE] = np.clip(moved[:, SCALE], 0.2, 2.0)
+        moved[:, CONTROL] = np.clip(moved[:, CONTROL], 0, 1)
+        return np.unique(np.round(moved, 4), axis=0)
+    
+    def _pest_probability(self, base_params: Dict, control) -> np.ndarray:
+        """Residual pest probability: each 0.1 of extra control removes 0.05"""
+        base_control = base_params.get("pest_control_intensity", 0.5)
+        return np.clip(base_params["pest_probability"] - 0.5 * (control - base_control), 0.05, 1.0)
+    
+    def _evaluate(
+        self,
+        base_params: Dict,
+        context,
+        families: List[Dict[str, float]],
+        scenarios: Dict,
+        price_path: np.ndarray,
+        candidates: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Profit and risk of every candidate (rows) under every scenario (columns)"""
+        crop = base_params["crop"]
+        soil_type = base_params["soil_type"]
+        area = base_params["area_hectares"]
+        rainfall = scenarios["rainfall"][np.newaxis, :]
+        
+        column = lambda index: candidates[:, index][:, np.newaxis]
+        pest_prob = np.clip(
+            self._pest_probability(base_params, column(CONTROL)) * scenarios["pest_shock"], 0, 1
+        )
+        
+        production = np.empty((len(candidates), len(rainfall[0])))
+        cost = np.empty_like(production)
+        confidence = np.empty_like(production)
+        for family, mix in enumerate(families):
+            rows = candidates[:, FAMILY] == family
+            if not rows.any():
+                continue
+            sub = lambda index: candidates[rows, index][:, np.newaxis]
+            inputs = {
+                "area_hectares": area,
+                "seed_quality": sub(SEED),
+                "seed_quantity_kg": base_params.get("seed_quantity_kg", area * 50),
+                "expected_rainfall": rainfall,
+                "rainfall_delay": base_params["rainfall_delay"],
+                "irrigation_frequency": sub(IRRIGATION),
+                "pest_probability": pest_prob[rows],
+                "labour_days": base_params.get("labour_days", 30),
+                "pest_control_intensity": sub(CONTROL),
+                "fertilizer_scale": sub(SCALE)
+            }
+            yield_result = self.yield_estimator.estimate_yield_batch(
+                crop, soil_type, inputs, mix, base_yield=context.base_yield
+            )
+            production[rows] = yield_result["total_production_quintals"]
+            confidence[rows] = yield_result["confidence"]
+            cost[rows] = self.cost_calculator.calculate_cost_batch(crop, inputs, production[rows], mix)["total_cost"]
+        
+        sale_day = np.minimum(59, candidates[:, MONTH] * 15).astype(int)
+        prices = price_path[sale_day][:, np.newaxis] * scenarios["price_scale"]
+        profit = production * prices - cost
+        
+        # CVaR: mean loss over the worst alpha share of scenarios
+        tail = max(1, math.ceil(config.OPTIMIZER["cvar_alpha"] * profit.shape[1]))
+        tail_mean = np.partition(profit, tail - 1, axis=1)[:, :tail].mean(axis=1)
+        
+        risk = self.risk_engine.calculate_risk_batch(crop, soil_type, {
+            "expected_rainfall": rainfall,
+            "rainfall_delay": base_params["rainfall_delay"],
+            "pest_probability": pest_prob
+        }, context.price_stats, confidence)["overall_risk_score"]
+        
+        return {
+            "candidates": candidates,
+            "mean_profit": profit.mean(axis=1),
+            "cvar_loss": -tail_mean,
+            "probability_of_profit": (profit > 0).mean(axis=1),
+            "mean_cost": cost.mean(axis=1),
+            "mean_risk": risk.mean(axis=1)
+        }
+    
+    def _concatenate(self, evaluated: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        return {key: np.concatenate([batch[key] for batch in evaluated]) for key in evaluated[0]}
+    
+    def _pareto_front(self, results: Dict[str, np.ndarray]) -> List[int]:
+        """Feasible candidates not beaten on both mean profit and mean risk, by ascending risk"""
+        indices = np.flatnonzero(results["feasible"])
+        order = indices[np.lexsort((-results["mean_profit"][indices], results["mean_risk"][indices]))]
+        front, best_profit = [], -np.inf
+        for i in order:
+            if results["mean_profit"][i] > best_profit:
+                front.append(int(i))
+                best_profit = results["mean_profit"][i]
+        
+        # Thin long fronts evenly, always keeping both ends
+        limit = config.OPTIMIZER["pareto_points"]
+        if len(front) > limit:
+            front = [front[i] for i in np.unique(np.linspace(0, len(front) - 1, limit).round().astype(int))]
+        return front
+    
+    def _decisions(self, families: List[Dict[str, float]], candidate: np.ndarray) -> Dict:
+        """Decision values of one candidate as plan parameters"""
+        mix = families[int(candidate[FAMILY])]
+        return {
+            "seed_quality": round(float(candidate[SEED]), 3),
+            "irrigation_frequency": int(candidate[IRRIGATION]),
+            "fertilizer_mix": {fert: round(qty * float(candidate[SCALE]), 1) for fert, qty in mix.items()},
+            "pest_control_intensity": round(float(candidate[CONTROL]), 3),
+            "sale_month": int(candidate[MONTH])
+        }
+    
+    def _plan_params(self, base_params: Dict, families: List[Dict[str, float]], candidate: np.ndarray) -> Dict:
+        """Full parameter set of the chosen plan"""
+        plan = base_params.copy()
+        plan.update(self._decisions(families, candidate))
+        plan["pest_probability"] = round(float(self._pest_probability(base_params, candidate[CONTROL])), 3)
+        return plan
+    
+    def _metrics_row(self, results: Dict[str, np.ndarray], index: int) -> Dict:
+        return {
+            "expected_profit": round(float(results["mean_profit"][index]), 2),
+            "cvar_loss": round(float(results["cvar_loss"][index]), 2),
+            "objective": round(float(results["objective"][index]), 2),
+            "probability_of_profit": round(float(results["probability_of_profit"][index]) * 100, 2),
+            "expected_cost": round(float(results["mean_cost"][index]), 2),
+            "mean_risk_score": round(float(results["mean_risk"][index]), 2)
+        }
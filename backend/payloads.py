@@ -0,0 +1,166 @@
+"""Response payload shaping (field projection, compact mode) and fast, compressed encoding"""
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:  # br is then not offered
+        brotli = None
+
+def _json_default(value: Any) -> Any:
+    """NumPy scalars and arrays for the stdlib encoder (orjson handles them natively)"""
+    # Duck-typed so that importing this module does not import numpy
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Compact JSON bytes, without a jsonable_encoder pass over the engine results
+    Uses orjson when installed, else json.dumps with the output JSONResponse produces
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_json_default
+    ).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps_json (orjson when available)"""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+def parse_fields(fields: Optional[str]) -> List[List[str]]:
+    """Dotted paths of a fields= parameter ("current_plan.profit,recommendation")"""
+    if not fields:
+        return []
+    return [path.strip().split(".") for path in fields.split(",") if path.strip()]
+
+def project(data: Any, paths: List[List[str]]) -> Any:
+    """
+    Keep only the given paths of data, preserving nesting
+    A path through a list applies to every element; unknown keys are skipped
+    """
+    if not paths:
+        return data
+    if isinstance(data, list):
+        return [project(item, paths) for item in data]
+    if not isinstance(data, dict):
+        return data
+    
+    # Group the remaining path segments by their first key
+    children: Dict[str, List[List[str]]] = {}
+    whole = set()
+    for path in paths:
+        if len(path) == 1:
+            whole.add(path[0])
+        else:
+            children.setdefault(path[0], []).append(path[1:])
+    
+    projected = {}
+    for key in data:
+        if key in whole:
+            projected[key] = data[key]
+        elif key in children:
+            projected[key] = project(data[key], children[key])
+    return projected
+
+def compact_forecast(forecast: Dict) -> Dict:
+    """Forecast with its daily date strings replaced by the first date (the dates are consecutive)"""
+    dates = forecast.get("forecast_dates")
+    if not dates:
+        return forecast
+    compacted = {key: value for key, value in forecast.items() if key != "forecast_dates"}
+    compacted["forecast_start_date"] = dates[0]
+    return compacted
+
+def compact(data: Dict) -> Dict:
+    """
+    Compact form of a scenario result (/simulate) or a scenario comparison (/compare_scenarios)
+    Scenarios of one comparison share their price forecast, which is sent once at the top
+    level; the current plan's parameters_used (the request's own input) is dropped
+    """
+    if "price_forecast" in data:
+        scenario = {key: value for key, value in data.items() if key != "price_forecast"}
+        scenario["price_forecast"] = compact_forecast(data["price_forecast"])
+        if data.get("scenario_type") == "current":
+            scenario.pop("parameters_used", None)
+        return scenario
+    
+    compacted = dict(data)
+    shared = None
+    for name, scenario in data.items():
+        if not isinstance(scenario, dict) or "price_forecast" not in scenario:
+            continue
+        if shared is None:
+            shared = scenario["price_forecast"]
+        scenario = dict(scenario)
+        if scenario["price_forecast"] is shared or scenario["price_forecast"] == shared:
+            del scenario["price_forecast"]
+        else:
+            scenario["price_forecast"] = compact_forecast(scenario["price_forecast"])
+        if scenario.get("scenario_type") == "current":
+            scenario.pop("parameters_used", None)
+        compacted[name] = scenario
+    if shared is not None:
+        compacted["price_forecast"] = compact_forecast(shared)
+    return compacted
+
+def shape(data: Dict, fields: Optional[str] = None, compact_mode: bool = False) -> Dict:
+    """Apply compact mode, then the fields= projection, to an endpoint's data"""
+    if compact_mode:
+        data = compact(data)
+    return project(data, parse_fields(fields))
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    """Whether an Accept-Encoding header allows coding (q=0 excludes it)"""
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip() == coding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+class StaticPayload:
+    """
+    JSON body of a fixed endpoint (/crops, /soils, /fertilizers), encoded once
+    with its ETag and gzip / br variants; conditional requests get a 304
+    """
+    
+    def __init__(self, content: Any):
+        self.body = dumps_json(content)
+        # Weak: the gzip / br variants share it
+        self.etag = 'W/"' + hashlib.sha256(self.body).hexdigest()[:16] + '"'
+        # Preferred coding first; a variant that does not shrink the body is not kept
+        variants = {"br": brotli.compress(self.body) if brotli is not None else None}
+        variants["gzip"] = gzip.compress(self.body, mtime=0)
+        self.encoded: Dict[str, bytes] = {
+            coding: body for coding, body in variants.items() if body is not None and len(body) < len(self.body)
+        }
+    
+    def _matches(self, if_none_match: str) -> bool:
+        """Weak comparison against an If-None-Match list"""
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or self.etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in tags)
+    
+    def response(self, if_none_match: Optional[str], accept_encoding: Optional[str]) -> Response:
+        headers = {"ETag": self.etag, "Vary": "Accept-Encoding", "Cache-Control": "public, max-age=3600"}
+        if if_none_match and self._matches(if_none_match):
+            return Response(status_code=304, headers=headers)
+        
+        for coding, body in self.encoded.items():
+            if accept_encoding and _accepts(accept_encoding, coding):
+                headers["Content-Encoding"] = coding
+                return Response(content=body, media_type="application/json", headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
@@ -1,43 +1,53 @@
 """Price forecasting using time series models"""
 import numpy as np
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
 from datetime import datetime, timedelta
-from data_loader import DataLoader
+import config
+from cache import LRUCache
+from data_loader import DataLoader, get_data_loader
+from streaming_stats import PathQuantileSketch
+
+# Anything np.random.default_rng accepts: an int, a SeedSequence or a Generator
+SeedLike = Union[int, np.random.SeedSequence, np.random.Generator]
 
 class PriceForecaster:
     """Forecast commodity prices using statistical methods"""
     
-    def __init__(self):
-        self.data_loader = DataLoader()
+    def __init__(self, data_loader: Optional[DataLoader] = None):
+        self.data_loader = data_loader or get_data_loader()
+        self.trend_cache = LRUCache(config.PRICE_CACHE_SIZE)
+        self.data_loader.register_cache(self.trend_cache)
     
     def forecast_prices(
         self,
         commodity: str,
         current_price: float,
-        forecast_days: int = 60
+        forecast_days: int = 60,
+        ensemble_paths: int = 0,
+        seed: Optional[SeedLike] = None
     ) -> Dict:
         """
         Forecast prices for next N days
         Uses simplified trend + seasonality + noise model
+        With ensemble_paths > 0 the forecast is the median of that many simulated
+        paths and P10/P50/P90 bands are returned alongside it.
+        Noise comes from a generator built from seed (config.DEFAULT_SEED if None)
         """
-        # Get historical price data
-        historical = self.data_loader.get_commodity_prices(commodity, days=180)
-        
-        if len(historical) > 10:
-            # Use historical data for forecasting
-            prices = historical['Modal_x0020_Price'].dropna().values
-            trend, volatility = self._calculate_trend_and_volatility(prices)
-        else:
-            # Use default patterns
-            trend = 0.001  # Slight upward trend
-            volatility = 0.15
-            prices = np.array([current_price] * 30)
+        trend, volatility = self._get_trend_and_volatility(commodity)
+        rng = np.random.default_rng(config.DEFAULT_SEED if seed is None else seed)
         
         # Generate forecast
-        forecast = self._generate_forecast(
-            current_price, trend, volatility, forecast_days
-        )
+        ensemble = None
+        if ensemble_paths > 0:
+            ensemble = self._generate_ensemble(
+                current_price, trend, volatility, forecast_days, ensemble_paths, rng
+            )
+            forecast = np.array(ensemble["p50"])
+        else:
+            forecast = self._generate_forecast(
+                current_price, trend, volatility, forecast_days, rng=rng
+            )
         
         # Find optimal selling window
         selling_window = self._find_optimal_selling_window(forecast)
@@ -50,7 +60,7 @@ class PriceForecaster:
             "std_deviation": round(np.std(forecast), 2)
         }
         
-        return {
+        result = {
             "forecast_prices": [round(p, 2) for p in forecast],
             "forecast_dates": self._generate_date_range(forecast_days),
             "current_price": current_price,
@@ -59,6 +69,44 @@ class PriceForecaster:
             "trend": "Upward" if trend > 0.005 else "Downward" if trend < -0.005 else "Stable",
             "volatility_level": "High" if volatility > 0.25 else "Moderate" if volatility > 0.15 else "Low"
         }
+        
+        if ensemble is not None:
+            result["ensemble"] = ensemble
+        
+        return result
+    
+    def forecast_path(
+        self,
+        commodity: str,
+        current_price: float,
+        forecast_days: int = 60,
+        seed: Optional[SeedLike] = None
+    ) -> np.ndarray:
+        """Unrounded single forecast path (the series behind forecast_prices)"""
+        trend, volatility = self._get_trend_and_volatility(commodity)
+        rng = np.random.default_rng(config.DEFAULT_SEED if seed is None else seed)
+        return self._generate_forecast(current_price, trend, volatility, forecast_days, rng=rng)
+    
+    def _get_trend_and_volatility(self, commodity: str, window: int = 180) -> tuple:
+        """Trend and volatility from historical prices (memoized per commodity and window)"""
+        key = (commodity.lower(), window, self.data_loader.price_generation(commodity))
+        return self.trend_cache.get_or_compute(
+            key, lambda: self._historical_trend_and_volatility(commodity, window)
+        )
+    
+    def _historical_trend_and_volatility(self, commodity: str, window: int) -> tuple:
+        """Trend and volatility of the most recent modal prices, or defaults without history"""
+        historical = self.data_loader.get_commodity_price_arrays(commodity, days=window)
+        
+        if len(historical.rows) > 10:
+            # Use historical data for forecasting
+            prices = historical.modal[~np.isnan(historical.modal)]
+            return self._calculate_trend_and_volatility(prices)
+        
+        # Use default patterns
+        trend = 0.001  # Slight upward trend
+        volatility = 0.15
+        return trend, volatility
     
     def _calculate_trend_and_volatility(self, prices: np.ndarray) -> tuple:
         """Calculate price trend and volatility from historical data"""
@@ -81,28 +129,78 @@ class PriceForecaster:
         current_price: float,
         trend: float,
         volatility: float,
-        days: int
+        days: int,
+        num_paths: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None
     ) -> np.ndarray:
-        """Generate price forecast using stochastic model"""
-        np.random.seed(42)  # For reproducibility
-        
-        forecast = np.zeros(days)
-        forecast[0] = current_price
-        
-        # Seasonal pattern (simplified)
-        seasonal_pattern = self._generate_seasonal_pattern(days)
-        
-        for i in range(1, days):
-            # Random walk with drift + seasonality
-            drift = trend
-            shock = np.random.normal(0, volatility)
-            seasonal = seasonal_pattern[i]
-            
-            # Price evolution
-            price_change = forecast[i-1] * (drift + shock + seasonal)
-            forecast[i] = max(current_price * 0.5, forecast[i-1] + price_change)
-        
-        return forecast
+        """
+        Generate price forecast using stochastic model
+        Returns one path of length days, or a (num_paths, days) matrix of independent paths
+        """
+        if rng is None:
+            rng = np.random.default_rng(config.DEFAULT_SEED)  # For reproducibility
+        
+        shape = (days - 1,) if num_paths is None else (num_paths, days - 1)
+        shocks = rng.normal(0, volatility, size=shape)
+        return self._paths_from_shocks(current_price, trend, shocks)
+    
+    def _generate_ensemble(
+        self,
+        current_price: float,
+        trend: float,
+        volatility: float,
+        days: int,
+        num_paths: int,
+        rng: np.random.Generator
+    ) -> Dict:
+        """
+        Simulate num_paths price paths in fixed-size batches and reduce them to
+        per-day P10/P50/P90 bands and expected value without keeping the paths
+        """
+        params = config.FORECAST_ENSEMBLE
+        # Paths never fall below the floor; the upper edge covers 6 sigma of drift + noise
+        floor = current_price * 0.5
+        spread = abs(trend) * days + 6 * volatility * np.sqrt(days)
+        ceiling = current_price * np.exp(min(spread, 50.0)) * 1.1
+        sketch = PathQuantileSketch(days, floor, ceiling, params["histogram_bins"])
+        
+        for start in range(0, num_paths, params["chunk_paths"]):
+            batch = min(params["chunk_paths"], num_paths - start)
+            shocks = rng.normal(0, volatility, size=(batch, days - 1))
+            sketch.update(self._paths_from_shocks(current_price, trend, shocks))
+        
+        p10, p50, p90 = sketch.quantiles([0.1, 0.5, 0.9])
+        # Day 0 is the known current price
+        p10[0] = p50[0] = p90[0] = current_price
+        
+        return {
+            "num_paths": num_paths,
+            "p10": [round(p, 2) for p in p10],
+            "p50": [round(p, 2) for p in p50],
+            "p90": [round(p, 2) for p in p90],
+            "expected": [round(p, 2) for p in sketch.mean()]
+        }
+    
+    def _paths_from_shocks(self, current_price: float, trend: float, shocks: np.ndarray) -> np.ndarray:
+        """
+        Random walk with drift + seasonality, floored at half the current price
+        shocks holds the daily noise along the last axis; each path starts at current_price
+        """
+        steps = shocks.shape[-1]
+        seasonal = self._generate_seasonal_pattern(steps + 1)[1:]
+        
+        # Daily growth factors; a step that would take the price to zero or below lands on the floor
+        log_growth = np.log(np.maximum(1.0 + trend + shocks + seasonal, 1e-12))
+        
+        # In log space relative to the floor the walk is x[i] = max(0, x[i-1] + log_growth[i]),
+        # which is the cumulative sum reflected at zero by its running minimum
+        walk = np.log(2.0) + np.cumsum(log_growth, axis=-1)
+        reflected = walk - np.minimum(0, np.minimum.accumulate(walk, axis=-1))
+        
+        paths = np.empty(shocks.shape[:-1] + (steps + 1,))
+        paths[..., 0] = current_price
+        paths[..., 1:] = current_price * 0.5 * np.exp(reflected)
+        return paths
     
     def _generate_seasonal_pattern(self, days: int) -> np.ndarray:
         """Generate simplified seasonal pattern"""
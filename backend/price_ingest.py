@@ -0,0 +1,212 @@
+"""Chunked, bounded-memory ingestion of the mandi price file"""
+import io
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Union
+
+# Columns the engines use; everything else in the file is skipped while parsing
+TEXT_COLUMNS = ["State", "Market", "Commodity"]
+PRICE_COLUMNS = ["Min_x0020_Price", "Max_x0020_Price", "Modal_x0020_Price"]
+DATE_COLUMN = "Arrival_Date"
+
+# Arrival dates in AGMARKNET exports are day first (dd/mm/yyyy)
+AGMARKNET_DATE_FORMAT = "%d/%m/%Y"
+
+def newest_first_key(dates: np.ndarray) -> np.ndarray:
+    """Ascending sort key that orders dates newest first with NaT last"""
+    return np.where(np.isnat(dates), np.iinfo(np.int64).max, -dates.view('i8'))
+
+class Vocabulary:
+    """Interns the strings of a text column as integer codes shared by every chunk"""
+    
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+    
+    def encode(self, values: pd.Series) -> np.ndarray:
+        """Codes of values (-1 for missing), adding unseen strings"""
+        local, uniques = pd.factorize(values)
+        # Local code -1 (missing) picks the trailing -1
+        lookup = np.array([self.codes.setdefault(str(value), len(self.codes)) for value in uniques] + [-1], dtype=np.int32)
+        return lookup[local]
+    
+    @property
+    def names(self) -> List[str]:
+        return list(self.codes)
+
+class CommodityBuffer:
+    """
+    Rows of one commodity, trimmed to its most recent history_rows
+    Pieces are appended per chunk and only merged once they exceed twice
+    the limit, so trimming costs amortized O(1) per row
+    """
+    
+    def __init__(self, history_rows: int):
+        self.history_rows = history_rows
+        self.pieces: List[Dict[str, np.ndarray]] = []
+        self.length = 0
+        self.dropped = 0
+    
+    def append(self, piece: Dict[str, np.ndarray]):
+        self.pieces.append(piece)
+        self.length += len(piece["row"])
+        if self.history_rows and self.length > 2 * self.history_rows:
+            self.compact()
+    
+    def compact(self) -> Dict[str, np.ndarray]:
+        """Merge the pieces into newest-first order (file order among equal dates)"""
+        merged = {name: np.concatenate([piece[name] for piece in self.pieces]) for name in self.pieces[0]}
+        order = np.lexsort((merged["row"], newest_first_key(merged["date"])))
+        if self.history_rows:
+            self.dropped += max(0, len(order) - self.history_rows)
+            order = order[:self.history_rows]
+        merged = {name: column[order] for name, column in merged.items()}
+        self.pieces, self.length = [merged], len(order)
+        return merged
+
+class _Prefix(io.RawIOBase):
+    """Read-only view of the first length bytes of a file"""
+    
+    def __init__(self, handle: BinaryIO, length: int):
+        self.handle = handle
+        self.remaining = length
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        count = self.handle.readinto(memoryview(buffer)[:min(len(buffer), self.remaining)])
+        self.remaining -= count
+        return count
+
+def read_price_chunks(data: Union[Path, BinaryIO], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Chunks of the price CSV, restricted to the columns the engines use"""
+    wanted = set(TEXT_COLUMNS + PRICE_COLUMNS + [DATE_COLUMN])
+    return pd.read_csv(
+        data,
+        usecols=lambda column: column in wanted,
+        # Text and dates repeat heavily, so each distinct value is parsed only once per chunk
+        dtype={column: "category" for column in TEXT_COLUMNS + [DATE_COLUMN]},
+        chunksize=chunk_rows
+    )
+
+class PriceIngester:
+    """
+    Incremental parse of price rows: vocabularies shared by every chunk and the
+    retained rows of each commodity. Only the most recent history_rows rows of
+    each commodity are kept (0 = all), so memory is bounded by the chunk size
+    and the retained history, not by how many rows pass through.
+    Arrival dates are parsed with date_format; dates that do not match it are
+    parsed as ISO dates or else day first, and the rows whose date still
+    cannot be read are counted in unparsed_dates (their date is NaT)
+    """
+    
+    def __init__(self, history_rows: int = 0, date_format: str = AGMARKNET_DATE_FORMAT):
+        self.history_rows = history_rows
+        self.date_format = date_format
+        self.vocabularies = {column: Vocabulary() for column in TEXT_COLUMNS}
+        self.buffers: Dict[int, CommodityBuffer] = {}
+        self.rows_read = 0
+        self.unparsed_dates = 0
+    
+    def add_chunk(self, chunk: pd.DataFrame):
+        """Add a chunk of raw price rows (columns as in the CSV)"""
+        size = len(chunk)
+        columns = {"row": np.arange(self.rows_read, self.rows_read + size)}
+        self.rows_read += size
+        
+        for column in TEXT_COLUMNS:
+            columns[column] = (
+                self.vocabularies[column].encode(chunk[column]) if column in chunk.columns
+                else np.full(size, -1, dtype=np.int32)
+            )
+        
+        if DATE_COLUMN in chunk.columns:
+            values = chunk[DATE_COLUMN].astype("category")
+            categories = values.cat.categories
+            distinct = pd.to_datetime(categories, format=self.date_format, errors='coerce')
+            # Leftovers: ISO dates, then any other layout read day first
+            for fallback in ({"format": "ISO8601"}, {"format": "mixed", "dayfirst": True}):
+                leftover = distinct.isna()
+                if not leftover.any():
+                    break
+                distinct = distinct.where(~leftover, pd.to_datetime(categories.where(leftover), errors='coerce', **fallback))
+            failed = np.flatnonzero(distinct.isna())
+            if len(failed):
+                self.unparsed_dates += int(np.isin(values.cat.codes.to_numpy(), failed).sum())
+            # Code -1 (missing) picks the trailing NaT
+            lookup = np.append(distinct.to_numpy(dtype='datetime64[ns]'), np.datetime64('NaT', 'ns'))
+            columns["date"] = lookup[values.cat.codes.to_numpy()]
+        else:
+            columns["date"] = np.full(size, np.datetime64('NaT'), dtype='datetime64[ns]')
+        
+        for column in PRICE_COLUMNS:
+            columns[column] = (
+                pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=np.float32) if column in chunk.columns
+                else np.full(size, np.nan, dtype=np.float32)
+            )
+        
+        # Route the chunk's rows to their commodity (rows without one are not indexed)
+        commodity = columns["Commodity"]
+        order = np.argsort(commodity, kind='stable')
+        order = order[commodity[order] >= 0]
+        codes, starts = np.unique(commodity[order], return_index=True)
+        for code, block in zip(codes, np.split(order, starts[1:])):
+            buffer = self.buffers.setdefault(int(code), CommodityBuffer(self.history_rows))
+            buffer.append({name: values[block] for name, values in columns.items()})
+    
+    def frame(self) -> pd.DataFrame:
+        """
+        The retained rows in index order: by commodity name, newest arrival first
+        Text columns are categoricals and prices float32
+        """
+        names = self.vocabularies["Commodity"].names
+        ranked = sorted(self.buffers, key=lambda code: names[code])
+        blocks = [self.buffers[code].compact() for code in ranked]
+        merged = {
+            name: np.concatenate([block[name] for block in blocks]) if blocks else np.array([])
+            for name in ["row", "date"] + TEXT_COLUMNS + PRICE_COLUMNS
+        }
+        commodity_rank = np.repeat(np.arange(len(ranked)), [len(block["row"]) for block in blocks])
+        
+        frame = {}
+        for column in ["State", "Market"]:
+            frame[column] = pd.Categorical.from_codes(
+                merged[column].astype(np.int32), categories=self.vocabularies[column].names
+            )
+        frame["Commodity"] = pd.Categorical.from_codes(commodity_rank, categories=[names[code] for code in ranked])
+        frame[DATE_COLUMN] = merged["date"].astype('datetime64[ns]')
+        for column in PRICE_COLUMNS:
+            frame[column] = merged[column].astype(np.float32)
+        
+        return pd.DataFrame(frame)
+    
+    def report(self, label: str):
+        """Print what the ingest dropped or could not date (nothing if all rows were kept and dated)"""
+        dropped = sum(buffer.dropped for buffer in self.buffers.values())
+        if dropped:
+            print(f"{label}: kept the newest {self.history_rows} rows per commodity, dropped {dropped} older rows")
+        if self.unparsed_dates:
+            print(f"{label}: {self.unparsed_dates} rows have an unreadable Arrival_Date and sort after all dated rows")
+
+def ingest_price_file(
+    source: Path,
+    chunk_rows: int,
+    history_rows: int = 0,
+    date_format: str = AGMARKNET_DATE_FORMAT
+) -> pd.DataFrame:
+    """
+    Parse the mandi price CSV in chunks of chunk_rows (see PriceIngester)
+    The frame's attrs record the bytes consumed ("source_length", where rows
+    appended later start)
+    """
+    length = source.stat().st_size
+    ingester = PriceIngester(history_rows, date_format)
+    with open(source, "rb") as handle:
+        for chunk in read_price_chunks(io.BufferedReader(_Prefix(handle, length)), chunk_rows):
+            ingester.add_chunk(chunk)
+    
+    frame = ingester.frame()
+    ingester.report(source.name)
+    frame.attrs["source_length"] = length
+    return frame
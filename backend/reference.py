@@ -0,0 +1,107 @@
+"""Reference tables from config compiled to integer IDs and dense NumPy lookup arrays"""
+import numpy as np
+from types import SimpleNamespace
+from typing import Dict, List, Union
+import config
+
+NUTRIENTS = ("N", "P", "K")
+
+# A crop or soil name, or an array of names (one per row of a batch)
+NameInput = Union[str, np.ndarray, List[str]]
+
+def _frozen(values) -> np.ndarray:
+    array = np.array(values, dtype=float)
+    array.flags.writeable = False
+    return array
+
+def _index_array(names, ids: Dict[str, int], unknown: int) -> np.ndarray:
+    names = np.asarray(names, dtype=object)
+    codes = np.fromiter((ids.get(name, unknown) for name in names.flat), dtype=np.intp, count=names.size)
+    return codes.reshape(names.shape)
+
+class ReferenceTables:
+    """
+    Crops, soils and fertilizers numbered in config order, with the per-crop,
+    per-soil and per-fertilizer tables materialized as arrays indexed by those IDs
+    The last crop ID and the last soil ID stand for any name config does not know,
+    so a lookup never needs a dict fallback. Batched code indexes the arrays; scalar
+    code reads the same tables as nested lists (REFERENCE.scalar), which avoids
+    NumPy scalar overhead
+    """
+    
+    def __init__(self):
+        # Every crop named anywhere in the reference tables, config.CROPS first
+        crops = list(dict.fromkeys(
+            config.CROPS + list(config.CROP_SOIL_COMPATIBILITY) + list(config.DEFAULT_YIELDS)
+            + list(config.OPTIMAL_RAINFALL_RANGES) + list(config.OPTIMAL_NPK)
+            + [crop for crop in config.COST_PARAMS["seed_cost_per_kg"] if crop != "default"]
+        ))
+        soils = list(dict.fromkeys(config.SOIL_TYPES + list(config.DEFAULT_SOIL_COMPATIBILITY)))
+        
+        self.crop_names = crops
+        self.soil_names = soils
+        self.fertilizer_names = list(config.FERTILIZERS)
+        self.crop_ids: Dict[str, int] = {name: i for i, name in enumerate(crops)}
+        self.soil_ids: Dict[str, int] = {name: i for i, name in enumerate(soils)}
+        self.fertilizer_ids: Dict[str, int] = {name: i for i, name in enumerate(self.fertilizer_names)}
+        self.unknown_crop = len(crops)
+        self.unknown_soil = len(soils)
+        known_crops = crops + [None]
+        known_soils = soils + [None]
+        
+        # Yield modifier: the crop's own compatibility, else the soil's default
+        self.soil_modifier = _frozen([
+            [
+                config.CROP_SOIL_COMPATIBILITY.get(crop, {}).get(
+                    soil, config.DEFAULT_SOIL_COMPATIBILITY.get(soil, config.FALLBACK_SOIL_COMPATIBILITY)
+                )
+                for soil in known_soils
+            ]
+            for crop in known_crops
+        ])
+        
+        # Soil mismatch risk: the crop's own compatibility, else the fallback
+        self.soil_compatibility = _frozen([
+            [
+                config.CROP_SOIL_COMPATIBILITY.get(crop, {}).get(soil, config.FALLBACK_SOIL_COMPATIBILITY)
+                for soil in known_soils
+            ]
+            for crop in known_crops
+        ])
+        
+        # (low, high) mm, target (N, P, K) kg/hectare, seed INR/kg and base yield kg/hectare per crop
+        self.rainfall_range = _frozen([
+            config.OPTIMAL_RAINFALL_RANGES.get(crop, config.DEFAULT_RAINFALL_RANGE) for crop in known_crops
+        ])
+        self.npk_target = _frozen([config.OPTIMAL_NPK.get(crop, config.DEFAULT_NPK) for crop in known_crops])
+        seed_costs = config.COST_PARAMS["seed_cost_per_kg"]
+        self.seed_cost = _frozen([seed_costs.get(crop, seed_costs["default"]) for crop in known_crops])
+        self.default_yield = _frozen([config.DEFAULT_YIELDS.get(crop, config.FALLBACK_YIELD) for crop in known_crops])
+        
+        # Nutrient content (% N, P, K), the same as kg per kg of product, and price (INR/kg) per fertilizer
+        self.fertilizer_nutrients = _frozen([
+            [config.FERTILIZERS[name][nutrient] for nutrient in NUTRIENTS] for name in self.fertilizer_names
+        ])
+        self.fertilizer_npk = _frozen(self.fertilizer_nutrients / 100)
+        self.fertilizer_cost = _frozen([config.FERTILIZERS[name]["cost_per_kg"] for name in self.fertilizer_names])
+        
+        tables = [
+            "soil_modifier", "soil_compatibility", "rainfall_range", "npk_target", "seed_cost",
+            "default_yield", "fertilizer_nutrients", "fertilizer_npk", "fertilizer_cost"
+        ]
+        self.scalar = SimpleNamespace(**{name: getattr(self, name).tolist() for name in tables})
+    
+    def crop_index(self, crop: NameInput) -> Union[int, np.ndarray]:
+        """Crop ID of a name, or an ID array for an array of names"""
+        if isinstance(crop, str):
+            return self.crop_ids.get(crop, self.unknown_crop)
+        return _index_array(crop, self.crop_ids, self.unknown_crop)
+    
+    def soil_index(self, soil_type: NameInput) -> Union[int, np.ndarray]:
+        """Soil ID of a name, or an ID array for an array of names"""
+        if isinstance(soil_type, str):
+            return self.soil_ids.get(soil_type, self.unknown_soil)
+        return _index_array(soil_type, self.soil_ids, self.unknown_soil)
+
+# Compiled once per process; config is not modified at runtime
+REFERENCE = ReferenceTables()
@@ -0,0 +1,154 @@
+"""Content-addressed cache of serialized API responses"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+class ResponseCache:
+    """
+    Serialized JSON responses keyed by a canonical hash of the request
+    In memory: TTL expiry plus LRU eviction by entry count and total bytes.
+    Optionally backed by a SQLite file so all workers on a host share results;
+    the memory tier never touches the disk, the *_disk methods block on SQLite
+    """
+    
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        sqlite_path: str = ""
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        # The SQLite tier has its own lock, so slow disk I/O never holds up the memory tier
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires_at REAL, body BLOB)"
+            )
+    
+    @staticmethod
+    def make_key(endpoint: str, payload: Dict, dataset_id: str) -> str:
+        """Canonical SHA-256 of the endpoint, validated request payload and dataset identity"""
+        canonical = json.dumps(
+            {"endpoint": endpoint, "payload": payload, "dataset": dataset_id},
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached body for key from the memory tier, or None if absent or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, body = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return body
+                self._remove(key)
+            if self._db is None:
+                self.misses += 1
+            return None
+    
+    def get_disk(self, key: str) -> Optional[bytes]:
+        """
+        Cached body for key from the SQLite tier (promoted to memory), or None
+        Blocking: call it from a worker thread, not the event loop
+        """
+        if self._db is None:
+            return None
+        now = time.time()
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT expires_at, body FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self._store(key, row[0], bytes(row[1]))
+            self.disk_hits += 1
+        return bytes(row[1])
+    
+    def put(self, key: str, body: bytes) -> float:
+        """Store a serialized response in memory; returns its expiry time for put_disk"""
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store(key, expires_at, body)
+        return expires_at
+    
+    def put_disk(self, key: str, body: bytes, expires_at: float):
+        """
+        Store a serialized response in the SQLite tier
+        Blocking: call it from a worker thread, not the event loop
+        """
+        if self._db is None:
+            return
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, expires_at, body) VALUES (?, ?, ?)",
+                (key, expires_at, body)
+            )
+            # Expired rows are pruned opportunistically; TTL bounds the file size
+            if self.misses % 256 == 0:
+                self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+    
+    def _store(self, key: str, expires_at: float, body: bytes):
+        if key in self._entries:
+            self._remove(key)
+        if len(body) > self.max_bytes:
+            return
+        self._entries[key] = (expires_at, body)
+        self._bytes += len(body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+    
+    def _remove(self, key: str):
+        _, body = self._entries.pop(key)
+        self._bytes -= len(body)
+    
+    def clear(self):
+        """Drop every cached response (memory and disk)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM responses")
+    
+    def stats(self) -> Dict:
+        """Size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "disk_tier": self._db is not None
+            }
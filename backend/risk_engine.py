@@ -1,14 +1,33 @@
 """Risk assessment and scoring engine"""
 import numpy as np
-from typing import Dict
+from bisect import bisect_right
+from typing import Dict, Optional
 import config
-from data_loader import DataLoader
+from batch_inputs import BatchInputs, batch_column
+from data_loader import DataLoader, get_data_loader
+from reference import REFERENCE, NameInput
+
+# Rainfall risk: the first (low, high, risk) band containing the rainfall (mm, inclusive), else the default
+RAINFALL_RISK_BANDS = [(600, 1200, 20), (400, 1500, 40), (200, 2000, 60)]
+RAINFALL_RISK_DEFAULT = 80
+
+# Each day of rainfall delay adds 2 points, up to 40
+DELAY_RISK_PER_DAY = 2
+MAX_DELAY_RISK = 40
+
+# Price volatility bands (<15%, <25%, <35%, above) and their risk scores
+PRICE_VOLATILITY_BANDS = [0.15, 0.25, 0.35]
+PRICE_RISK_LEVELS = [20, 40, 60, 80]
+
+# Overall score bands (<25, <50, <70, above) and their categories
+RISK_CATEGORY_BANDS = [25, 50, 70]
+RISK_CATEGORIES = ["Low Risk", "Moderate Risk", "High Risk", "Very High Risk"]
 
 class RiskEngine:
     """Assess farming risks and generate risk scores"""
     
-    def __init__(self):
-        self.data_loader = DataLoader()
+    def __init__(self, data_loader: Optional[DataLoader] = None):
+        self.data_loader = data_loader or get_data_loader()
     
     def calculate_risk_score(
         self,
@@ -62,23 +81,73 @@ class RiskEngine:
             "insights": insights
         }
     
+    def calculate_risk_batch(
+        self,
+        crop: NameInput,
+        soil_type: NameInput,
+        inputs: BatchInputs,
+        price_statistics: Dict,
+        yield_confidence
+    ) -> Dict[str, np.ndarray]:
+        """
+        Array-native risk model for batch, Monte Carlo and optimizer runs
+        inputs holds expected_rainfall, rainfall_delay and pest_probability
+        (broadcastable columns, as for YieldEstimator.estimate_yield_batch);
+        crop and soil_type may be per-row name arrays.
+        Returns unrounded arrays: the four components and overall_risk_score
+        """
+        # Individual risk components
+        weather_risk = self._calculate_weather_risk_batch(
+            batch_column(inputs, "expected_rainfall"), batch_column(inputs, "rainfall_delay")
+        )
+        price_risk = self._calculate_price_risk(price_statistics)
+        pest_risk = self._calculate_pest_risk(batch_column(inputs, "pest_probability"))
+        soil_risk = self._calculate_soil_risk(crop, soil_type)
+        
+        # Weighted composite risk score
+        composite_risk = (
+            weather_risk * config.RISK_WEIGHTS["weather_uncertainty"] +
+            price_risk * config.RISK_WEIGHTS["price_volatility"] +
+            pest_risk * config.RISK_WEIGHTS["pest_severity"] +
+            soil_risk * config.RISK_WEIGHTS["soil_mismatch"]
+        )
+        
+        # Adjust for yield confidence (low confidence = higher risk)
+        confidence_penalty = (1 - np.asarray(yield_confidence, dtype=float)) * 10
+        
+        return {
+            "weather_risk": weather_risk,
+            "price_volatility_risk": price_risk,
+            "pest_attack_risk": pest_risk,
+            "soil_mismatch_risk": soil_risk,
+            "overall_risk_score": np.minimum(100, composite_risk + confidence_penalty)
+        }
+    
     def _calculate_weather_risk(self, rainfall: float, delay: int) -> float:
         """Weather uncertainty risk (0-100)"""
-        # Rainfall adequacy risk
-        if 600 <= rainfall <= 1200:
-            rainfall_risk = 20  # Good rainfall
-        elif 400 <= rainfall < 600 or 1200 < rainfall <= 1500:
-            rainfall_risk = 40  # Moderate
-        elif 200 <= rainfall < 400 or 1500 < rainfall <= 2000:
-            rainfall_risk = 60  # High risk
-        else:
-            rainfall_risk = 80  # Very high risk
+        # Rainfall adequacy risk: good, moderate, high, otherwise very high
+        rainfall_risk = RAINFALL_RISK_DEFAULT
+        for low, high, risk in RAINFALL_RISK_BANDS:
+            if low <= rainfall <= high:
+                rainfall_risk = risk
+                break
         
         # Delay risk (each day adds risk)
-        delay_risk = min(40, delay * 2)  # Max 40 points from delay
+        delay_risk = min(MAX_DELAY_RISK, delay * DELAY_RISK_PER_DAY)
         
         return min(100, rainfall_risk + delay_risk)
     
+    def _calculate_weather_risk_batch(self, rainfall, delay) -> np.ndarray:
+        """Vectorized _calculate_weather_risk"""
+        rainfall = np.asarray(rainfall, dtype=float)
+        rainfall_risk = np.select(
+            [(rainfall >= low) & (rainfall <= high) for low, high, _ in RAINFALL_RISK_BANDS],
+            [risk for _, _, risk in RAINFALL_RISK_BANDS],
+            default=RAINFALL_RISK_DEFAULT
+        )
+        delay_risk = np.minimum(MAX_DELAY_RISK, np.asarray(delay) * DELAY_RISK_PER_DAY)
+        return np.minimum(100, rainfall_risk + delay_risk)
+    
     def _calculate_price_risk(self, price_stats: Dict) -> float:
         """Market price volatility risk (0-100)"""
         volatility = price_stats.get("volatility", 0.25)
@@ -86,28 +155,20 @@ class RiskEngine:
         # Convert volatility to risk score
         # Low volatility (< 15%) = low risk
         # High volatility (> 40%) = high risk
-        if volatility < 0.15:
-            return 20
-        elif volatility < 0.25:
-            return 40
-        elif volatility < 0.35:
-            return 60
-        else:
-            return 80
+        return PRICE_RISK_LEVELS[bisect_right(PRICE_VOLATILITY_BANDS, volatility)]
     
     def _calculate_pest_risk(self, pest_probability: float) -> float:
         """Pest attack risk (0-100)"""
         # Direct mapping of probability to risk
         return pest_probability * 100
     
-    def _calculate_soil_risk(self, crop: str, soil_type: str) -> float:
+    def _calculate_soil_risk(self, crop: NameInput, soil_type: NameInput):
         """Soil compatibility risk (0-100)"""
-        # Get compatibility score
-        compatibility = 0.7  # Default
-        
-        if crop in config.CROP_SOIL_COMPATIBILITY:
-            if soil_type in config.CROP_SOIL_COMPATIBILITY[crop]:
-                compatibility = config.CROP_SOIL_COMPATIBILITY[crop][soil_type]
+        # Get compatibility score (the fallback for unknown combinations is compiled in)
+        if isinstance(crop, str) and isinstance(soil_type, str):
+            compatibility = REFERENCE.scalar.soil_compatibility[REFERENCE.crop_index(crop)][REFERENCE.soil_index(soil_type)]
+        else:
+            compatibility = REFERENCE.soil_compatibility[REFERENCE.crop_index(crop), REFERENCE.soil_index(soil_type)]
         
         # Convert to risk (inverse relationship)
         # High compatibility (>0.8) = low risk (20)
@@ -117,14 +178,11 @@ class RiskEngine:
     
     def _categorize_risk(self, score: float) -> str:
         """Categorize risk score into levels"""
-        if score < 25:
-            return "Low Risk"
-        elif score < 50:
-            return "Moderate Risk"
-        elif score < 70:
-            return "High Risk"
-        else:
-            return "Very High Risk"
+        return RISK_CATEGORIES[bisect_right(RISK_CATEGORY_BANDS, score)]
+    
+    def categorize_risk_batch(self, scores) -> np.ndarray:
+        """Vectorized _categorize_risk"""
+        return np.array(RISK_CATEGORIES)[np.digitize(scores, RISK_CATEGORY_BANDS)]
     
     def _generate_risk_insights(
         self, 
@@ -1,45 +1,93 @@
 """What-If simulation engine for scenario analysis"""
 import numpy as np
-from typing import Dict, List
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
 import config
+import metrics
 from yield_estimator import YieldEstimator
 from cost_calculator import CostCalculator
 from risk_engine import RiskEngine
-from price_forecaster import PriceForecaster
-from data_loader import DataLoader
+from price_forecaster import PriceForecaster, SeedLike
+from data_loader import DataLoader, get_data_loader
+from optimizer import PlanOptimizer
+from streaming_stats import QuantileSketch, RunningMoments
+
+# FarmingInput fields varied by the sensitivity analysis ("fertilizer_mix" scales the whole mix)
+SENSITIVITY_FIELDS = [
+    "area_hectares", "seed_quality", "expected_rainfall", "rainfall_delay", "irrigation_frequency",
+    "fertilizer_mix", "pest_probability", "labour_days", "pest_control_intensity", "sale_month",
+    "current_market_price", "seed_quantity_kg"
+]
+INTEGER_FIELDS = {"rainfall_delay", "irrigation_frequency", "sale_month"}
+UNIT_INTERVAL_FIELDS = {"seed_quality", "pest_probability", "pest_control_intensity"}
+
+class EvaluationContext:
+    """
+    Crop- and commodity-level invariants shared by every scenario of one request
+    Base yield and price statistics are looked up once; price forecasts are
+    memoized per starting price (scenarios copy it from the same base plan)
+    """
+    
+    def __init__(self, engine: "SimulationEngine", crop: str, forecast_seed: Optional[SeedLike] = None):
+        self.crop = crop
+        self.forecast_seed = forecast_seed
+        self.base_yield = engine.data_loader.get_crop_yield(crop)
+        self.price_stats = engine.data_loader.get_price_statistics(crop)
+        self._price_forecaster = engine.price_forecaster
+        self._forecasts: Dict[float, Dict] = {}
+    
+    def price_forecast(self, current_price: float) -> Dict:
+        """60-day forecast for the crop from current_price (same noise for every scenario)"""
+        forecast = self._forecasts.get(current_price)
+        if forecast is None:
+            forecast = self._price_forecaster.forecast_prices(
+                self.crop, current_price, forecast_days=60, seed=self.forecast_seed
+            )
+            self._forecasts[current_price] = forecast
+        return forecast
 
 class SimulationEngine:
     """Run Monte Carlo simulations for farming scenarios"""
     
-    def __init__(self):
-        self.yield_estimator = YieldEstimator()
+    def __init__(self, data_loader: Optional[DataLoader] = None):
+        # Every sub-engine shares one dataset store
+        self.data_loader = data_loader or get_data_loader()
+        self.yield_estimator = YieldEstimator(self.data_loader)
         self.cost_calculator = CostCalculator()
-        self.risk_engine = RiskEngine()
-        self.price_forecaster = PriceForecaster()
-        self.data_loader = DataLoader()
+        self.risk_engine = RiskEngine(self.data_loader)
+        self.price_forecaster = PriceForecaster(self.data_loader)
+        self.optimizer = PlanOptimizer(self)
     
     def run_whatif_simulation(
         self,
         base_params: Dict,
-        num_simulations: int = 500
+        num_simulations: int = 500,
+        seed: Optional[int] = None
     ) -> Dict:
         """
         Run multiple simulations with parameter variations
         Returns: Current Plan, AI Optimal Plan, Worst Case scenarios
+        All randomness derives from seed (config.DEFAULT_SEED if None)
         """
+        seed = config.DEFAULT_SEED if seed is None else seed
+        forecast_seed, micro_seed = request_seed_sequences(seed)
+        context = EvaluationContext(self, base_params["crop"], forecast_seed)
+        
         # Run base scenario (farmer's current plan)
-        current_plan = self._simulate_scenario(base_params, scenario_type="current")
+        current_plan = self._simulate_scenario(base_params, scenario_type="current", context=context)
         
         # Generate AI-optimized scenario
-        optimal_params = self._optimize_parameters(base_params)
-        optimal_plan = self._simulate_scenario(optimal_params, scenario_type="optimal")
+        optimal_params = self._optimize_parameters(base_params, context, optimizer_seed_sequence(seed))
+        optimal_plan = self._simulate_scenario(optimal_params, scenario_type="optimal", context=context)
         
         # Generate worst-case scenario
         worst_params = self._generate_worst_case(base_params)
-        worst_plan = self._simulate_scenario(worst_params, scenario_type="worst")
+        worst_plan = self._simulate_scenario(worst_params, scenario_type="worst", context=context)
         
         # Run Monte Carlo micro-simulations for uncertainty analysis
-        micro_simulations = self._run_micro_simulations(base_params, num_simulations)
+        micro_simulations = self._run_micro_simulations(
+            base_params, num_simulations, np.random.default_rng(micro_seed), context=context
+        )
         
         return {
             "current_plan": current_plan,
@@ -49,8 +97,53 @@ class SimulationEngine:
             "recommendation": self._generate_recommendation(current_plan, optimal_plan, worst_plan)
         }
     
-    def _simulate_scenario(self, params: Dict, scenario_type: str) -> Dict:
-        """Simulate a single farming scenario"""
+    def recommend(self, base_params: Dict, seed: Optional[int] = None) -> Dict:
+        """
+        Projection of run_whatif_simulation for /recommend
+        Only the current and optimal plans are evaluated: the worst case and the
+        micro-simulations never reach the recommendation, so they are skipped
+        """
+        seed = config.DEFAULT_SEED if seed is None else seed
+        forecast_seed, _ = request_seed_sequences(seed)
+        context = EvaluationContext(self, base_params["crop"], forecast_seed)
+        
+        current_plan = self._simulate_scenario(base_params, scenario_type="current", context=context)
+        optimal_plan = self._simulate_scenario(
+            self._optimize_parameters(base_params, context, optimizer_seed_sequence(seed)),
+            scenario_type="optimal", context=context
+        )
+        
+        current_risk = current_plan["risk"]["overall_risk_score"]
+        optimal_risk = optimal_plan["risk"]["overall_risk_score"]
+        return {
+            "recommendation_text": self._generate_recommendation(current_plan, optimal_plan),
+            "current_profit": current_plan["profit"],
+            "optimal_profit": optimal_plan["profit"],
+            "profit_improvement": optimal_plan["profit"] - current_plan["profit"],
+            "current_risk": current_risk,
+            "optimal_risk": optimal_risk,
+            "risk_reduction": current_risk - optimal_risk,
+            "key_insights": optimal_plan["risk"]["insights"],
+            "optimal_parameters": optimal_plan["parameters_used"]
+        }
+    
+    def _simulate_scenario(
+        self,
+        params: Dict,
+        scenario_type: str,
+        seed: Optional[SeedLike] = None,
+        context: Optional[EvaluationContext] = None
+    ) -> Dict:
+        """
+        Simulate a single farming scenario
+        seed drives the price forecast; scenarios given the same SeedSequence share
+        the same price noise, so their differences come from the plan alone.
+        A shared context (which carries its own seed) avoids repeating crop lookups
+        """
+        if context is None:
+            with metrics.stage("scenario.context"):
+                context = EvaluationContext(self, params["crop"], seed)
+        
         # Extract parameters
         crop = params["crop"]
         soil_type = params["soil_type"]
@@ -67,22 +160,23 @@ class SimulationEngine:
         current_price = params.get("current_market_price", 2000)
         
         # Estimate yield
-        yield_result = self.yield_estimator.estimate_yield(
-            crop, soil_type, seed_quality, rainfall, rainfall_delay,
-            irrigation, fertilizer, pest_prob, area
-        )
+        with metrics.stage("scenario.yield"):
+            yield_result = self.yield_estimator.estimate_yield(
+                crop, soil_type, seed_quality, rainfall, rainfall_delay,
+                irrigation, fertilizer, pest_prob, area, base_yield=context.base_yield
+            )
         
         # Calculate costs
         seed_qty = params.get("seed_quantity_kg", area * 50)
-        cost_result = self.cost_calculator.calculate_cultivation_cost(
-            crop, area, seed_qty, fertilizer, irrigation, rainfall,
-            labour_days, pest_control, yield_result["total_production_quintals"]
-        )
+        with metrics.stage("scenario.cost"):
+            cost_result = self.cost_calculator.calculate_cultivation_cost(
+                crop, area, seed_qty, fertilizer, irrigation, rainfall,
+                labour_days, pest_control, yield_result["total_production_quintals"]
+            )
         
         # Forecast prices
-        price_forecast = self.price_forecaster.forecast_prices(
-            crop, current_price, forecast_days=60
-        )
+        with metrics.stage("scenario.price_forecast"):
+            price_forecast = context.price_forecast(current_price)
         
         # Estimate selling price based on sale month
         sale_day = min(59, sale_month * 15)  # Convert month to day (approx)
@@ -94,11 +188,11 @@ class SimulationEngine:
         roi = (profit / cost_result["total_cost"] * 100) if cost_result["total_cost"] > 0 else 0
         
         # Calculate risk
-        price_stats = self.data_loader.get_price_statistics(crop)
-        risk_result = self.risk_engine.calculate_risk_score(
-            crop, soil_type, rainfall, rainfall_delay, pest_prob,
-            price_stats, yield_result["confidence"]
-        )
+        with metrics.stage("scenario.risk"):
+            risk_result = self.risk_engine.calculate_risk_score(
+                crop, soil_type, rainfall, rainfall_delay, pest_prob,
+                context.price_stats, yield_result["confidence"]
+            )
         
         return {
             "scenario_type": scenario_type,
@@ -113,35 +207,227 @@ class SimulationEngine:
             "parameters_used": params
         }
     
-    def _optimize_parameters(self, base_params: Dict) -> Dict:
-        """Generate optimized parameters for better outcomes"""
-        optimal = base_params.copy()
-        
-        # Optimize seed quality (increase to 0.85-0.95)
-        optimal["seed_quality"] = min(0.95, base_params["seed_quality"] + 0.15)
+    def simulate_batch(self, records: List[Dict], seed: Optional[int] = None) -> List[Dict]:
+        """
+        Evaluate many independent farm plans (e.g. every plot of a cooperative)
+        Records are grouped by crop (which fixes the price forecast) and each group is
+        evaluated as arrays, soil lookups by fancy indexing into the reference tables;
+        results are compact per-record summaries tagged with the record's "index"
+        """
+        seed = config.DEFAULT_SEED if seed is None else seed
+        forecast_seed, _ = request_seed_sequences(seed)
         
-        # Optimize irrigation (adjust based on rainfall)
-        if base_params["expected_rainfall"] < 600:
-            optimal["irrigation_frequency"] = base_params["irrigation_frequency"] + 2
+        groups: Dict[str, List[int]] = {}
+        for index, record in enumerate(records):
+            groups.setdefault(record["crop"], []).append(index)
         
-        # Optimize fertilizer mix (balanced NPK)
-        crop = base_params["crop"]
-        optimal_npk = {
-            "Rice": {"Urea": 150, "DAP": 80, "MOP": 60},
-            "Wheat": {"Urea": 180, "DAP": 100, "MOP": 60},
-            "Maize": {"Urea": 160, "DAP": 90, "MOP": 70},
+        results = []
+        for crop, indices in groups.items():
+            results.extend(self._simulate_group(crop, [records[i] for i in indices], indices, forecast_seed))
+        return results
+    
+    def _simulate_group(
+        self,
+        crop: str,
+        records: List[Dict],
+        indices: List[int],
+        forecast_seed: SeedLike
+    ) -> List[Dict]:
+        """Vectorized _simulate_scenario for records sharing a crop"""
+        def column(key: str, default=None) -> np.ndarray:
+            return np.array([record.get(key, default) for record in records], dtype=float)
+        
+        inputs = {
+            key: column(key, default) for key, default in [
+                ("area_hectares", None), ("seed_quality", None), ("expected_rainfall", None),
+                ("rainfall_delay", None), ("irrigation_frequency", None), ("pest_probability", None),
+                ("labour_days", 30), ("pest_control_intensity", 0.5)
+            ]
         }
-        if crop in optimal_npk:
-            optimal["fertilizer_mix"] = optimal_npk[crop]
-        
-        # Reduce pest risk through better control
-        optimal["pest_control_intensity"] = min(0.9, base_params.get("pest_control_intensity", 0.5) + 0.3)
-        optimal["pest_probability"] = max(0.05, base_params["pest_probability"] - 0.15)
-        
-        # Optimize sale timing based on price forecast
-        optimal["sale_month"] = 2  # Typically optimal window
-        
-        return optimal
+        inputs["seed_quantity_kg"] = np.array([
+            record["area_hectares"] * 50 if record.get("seed_quantity_kg") is None else record["seed_quantity_kg"]
+            for record in records
+        ], dtype=float)
+        fertilizer = [record["fertilizer_mix"] for record in records]
+        soil_type = [record["soil_type"] for record in records]
+        
+        yield_result = self.yield_estimator.estimate_yield_batch(crop, soil_type, inputs, fertilizer)
+        yields = np.round(yield_result["yield_per_hectare"], 2)
+        production = np.round(yield_result["total_production_quintals"], 2)
+        
+        total_cost = self.cost_calculator.calculate_cost_batch(crop, inputs, production, fertilizer)["total_cost"]
+        
+        # One relative forecast per crop; each record scales it by its own market price
+        relative_path = self.price_forecaster.forecast_path(crop, 1.0, forecast_days=60, seed=forecast_seed)
+        sale_day = np.minimum(59, column("sale_month", 3) * 15).astype(int)
+        expected_price = np.round(column("current_market_price", 2000) * relative_path[sale_day], 2)
+        
+        revenue = production * expected_price
+        profit = revenue - total_cost
+        roi = np.where(total_cost > 0, profit / np.where(total_cost > 0, total_cost, 1) * 100, 0)
+        
+        risks = self.risk_engine.calculate_risk_batch(
+            crop, soil_type, inputs,
+            self.data_loader.get_price_statistics(crop), np.round(yield_result["confidence"], 2)
+        )["overall_risk_score"]
+        categories = self.risk_engine.categorize_risk_batch(risks)
+        
+        return [
+            {
+                "index": index,
+                "crop": crop,
+                "soil_type": soil_type[i],
+                "yield_per_hectare": float(yields[i]),
+                "total_production_quintals": float(production[i]),
+                "total_cost": round(float(total_cost[i]), 2),
+                "expected_selling_price": float(expected_price[i]),
+                "revenue": round(float(revenue[i]), 2),
+                "profit": round(float(profit[i]), 2),
+                "roi_percentage": round(float(roi[i]), 2),
+                "overall_risk_score": round(float(risks[i]), 2),
+                "risk_category": str(categories[i])
+            }
+            for i, index in enumerate(indices)
+        ]
+    
+    def sensitivity_analysis(
+        self,
+        base_params: Dict,
+        seed: Optional[int] = None,
+        points: Optional[int] = None
+    ) -> Dict:
+        """
+        One-at-a-time sensitivity of profit and risk to every farming input
+        Each input is moved over a grid around its base value while the others stay
+        fixed; all grid points go through one batched _simulate_group pass.
+        Inputs are ranked by profit swing (tornado order)
+        """
+        seed = config.DEFAULT_SEED if seed is None else seed
+        forecast_seed, _ = request_seed_sequences(seed)
+        points = points or config.SENSITIVITY["points"]
+        
+        records = [base_params]
+        grids = {}
+        for field in SENSITIVITY_FIELDS:
+            values = self._sensitivity_grid(base_params, field, points)
+            grids[field] = (len(records), values)
+            records.extend(self._perturb(base_params, field, value) for value in values)
+        
+        results = self._simulate_group(base_params["crop"], records, list(range(len(records))), forecast_seed)
+        base = results[0]
+        
+        sensitivities = []
+        for field, (start, values) in grids.items():
+            rows = results[start:start + len(values)]
+            profits = [row["profit"] for row in rows]
+            base_value = 1.0 if field == "fertilizer_mix" else base_params[field]
+            low, high = values[0], values[-1]
+            
+            # Arc elasticity over the grid; relative to |profit| so the sign always
+            # says whether raising the input raises profit
+            slope = (profits[-1] - profits[0]) / (high - low) if high > low else 0.0
+            elasticity = None
+            if high > low and base_value != 0 and base["profit"] != 0:
+                elasticity = round(slope * base_value / abs(base["profit"]), 4)
+            
+            sensitivities.append({
+                "field": field,
+                "base_value": base_value,
+                "values": values,
+                "profit": profits,
+                "risk_score": [row["overall_risk_score"] for row in rows],
+                "profit_at_low": profits[0],
+                "profit_at_high": profits[-1],
+                "swing": round(max(profits) - min(profits), 2),
+                "profit_per_unit": round(slope, 2),
+                "elasticity": elasticity
+            })
+        
+        sensitivities.sort(key=lambda item: item["swing"], reverse=True)
+        return {
+            "base_profit": base["profit"],
+            "base_risk_score": base["overall_risk_score"],
+            "points_evaluated": len(records),
+            "ranking": [item["field"] for item in sensitivities],
+            "sensitivities": sensitivities
+        }
+    
+    def _sensitivity_grid(self, base_params: Dict, field: str, points: int) -> List[float]:
+        """Distinct values of one input spread over its span (clipped to valid ranges)"""
+        if field == "fertilizer_mix":
+            base_value = 1.0
+        else:
+            base_value = base_params[field]
+        
+        offsets = np.linspace(-1, 1, points)
+        span = config.SENSITIVITY["absolute_spans"].get(field)
+        if span is None:
+            values = base_value * (1 + offsets * config.SENSITIVITY["relative_span"])
+        else:
+            values = base_value + offsets * span
+        
+        values = np.maximum(values, 0)
+        if field in UNIT_INTERVAL_FIELDS:
+            values = np.minimum(values, 1)
+        if field in INTEGER_FIELDS:
+            values = np.round(values)
+        return [float(value) for value in np.unique(np.round(values, 4))]
+    
+    def _perturb(self, base_params: Dict, field: str, value: float) -> Dict:
+        """Copy of base_params with one input replaced"""
+        params = base_params.copy()
+        if field == "fertilizer_mix":
+            params["fertilizer_mix"] = {fert: qty * value for fert, qty in base_params["fertilizer_mix"].items()}
+        elif field == "area_hectares":
+            # Seed is sown per hectare, so it follows the area
+            params["area_hectares"] = value
+            if params.get("seed_quantity_kg") is not None and base_params["area_hectares"] > 0:
+                params["seed_quantity_kg"] = base_params["seed_quantity_kg"] * value / base_params["area_hectares"]
+        else:
+            params[field] = int(value) if field in INTEGER_FIELDS else value
+        return params
+    
+    def _optimize_parameters(
+        self,
+        base_params: Dict,
+        context: Optional[EvaluationContext] = None,
+        seed: Optional[SeedLike] = None
+    ) -> Dict:
+        """
+        Generate optimized parameters for better outcomes
+        Searches seed quality, irrigation, fertilizer, pest control and sale month
+        for the best risk-adjusted profit (see optimizer.PlanOptimizer)
+        The search has a fixed candidate budget and no time limit, so seeded results
+        do not depend on machine load
+        """
+        if context is None:
+            context = EvaluationContext(self, base_params["crop"])
+        rng = np.random.default_rng(config.DEFAULT_SEED if seed is None else seed)
+        with metrics.stage("optimizer"):
+            return self.optimizer.optimize(base_params, context, rng)["best_plan"]
+    
+    def optimize_plan(
+        self,
+        base_params: Dict,
+        seed: Optional[int] = None,
+        objective: str = "risk_adjusted",
+        risk_aversion: Optional[float] = None,
+        budget: Optional[float] = None,
+        time_budget_ms: Optional[float] = None
+    ) -> Dict:
+        """
+        Full optimizer report for /optimize: best plan, profit/risk Pareto front, diagnostics
+        Unlike the plans embedded in /compare_scenarios and /recommend, this search is
+        time-limited (time_budget_ms, default from config) and reports whether it was truncated
+        """
+        seed = config.DEFAULT_SEED if seed is None else seed
+        time_budget_ms = time_budget_ms or config.OPTIMIZER["time_budget_ms"]
+        forecast_seed, _ = request_seed_sequences(seed)
+        context = EvaluationContext(self, base_params["crop"], forecast_seed)
+        return self.optimizer.optimize(
+            base_params, context, np.random.default_rng(optimizer_seed_sequence(seed)),
+            objective, risk_aversion, budget, time_budget_ms
+        )
     
     def _generate_worst_case(self, base_params: Dict) -> Dict:
         """Generate worst-case scenario parameters"""
@@ -169,41 +455,23 @@ class SimulationEngine:
         
         return worst
     
-    def _run_micro_simulations(self, base_params: Dict, num_sims: int) -> Dict:
-        """Run multiple micro-simulations with random variations"""
-        np.random.seed(42)
-        
-        profits = []
-        yields = []
-        risks = []
-        
-        for _ in range(num_sims):
-            # Add random variations
-            sim_params = base_params.copy()
-            
-            # Rainfall variation (±20%)
-            rainfall_var = np.random.uniform(-0.2, 0.2)
-            sim_params["expected_rainfall"] = base_params["expected_rainfall"] * (1 + rainfall_var)
-            
-            # Pest probability variation (0-30%)
-            sim_params["pest_probability"] = np.random.uniform(0, 0.3)
-            
-            # Fertilizer variation (±15%)
-            fert_var = np.random.uniform(0.85, 1.15)
-            sim_params["fertilizer_mix"] = {
-                k: v * fert_var for k, v in base_params["fertilizer_mix"].items()
-            }
-            
-            # Price variation (±10%)
-            price_var = np.random.uniform(0.9, 1.1)
-            sim_params["current_market_price"] = base_params.get("current_market_price", 2000) * price_var
-            
-            # Run simulation
-            result = self._simulate_scenario(sim_params, "micro")
-            
-            profits.append(result["profit"])
-            yields.append(result["yield"]["yield_per_hectare"])
-            risks.append(result["risk"]["overall_risk_score"])
+    def _run_micro_simulations(
+        self,
+        base_params: Dict,
+        num_sims: int,
+        rng: np.random.Generator,
+        forecast_seed: Optional[SeedLike] = None,
+        context: Optional[EvaluationContext] = None
+    ) -> Dict:
+        """
+        Run multiple micro-simulations with random variations
+        All draws are evaluated together as NumPy arrays instead of one
+        _simulate_scenario call per draw
+        """
+        with metrics.stage("micro_simulations"):
+            profits, yields, risks = self._draw_micro_outcomes(
+                base_params, num_sims, rng, forecast_seed, context
+            )
         
         return {
             "num_simulations": num_sims,
@@ -225,10 +493,133 @@ class SimulationEngine:
                 "mean": round(np.mean(risks), 2),
                 "std": round(np.std(risks), 2)
             },
-            "probability_of_profit": round(sum(1 for p in profits if p > 0) / len(profits) * 100, 2)
+            "probability_of_profit": round(float(np.mean(profits > 0)) * 100, 2)
         }
     
-    def _generate_recommendation(self, current: Dict, optimal: Dict, worst: Dict) -> str:
+    def _draw_micro_outcomes(
+        self,
+        base_params: Dict,
+        num_sims: int,
+        rng: np.random.Generator,
+        forecast_seed: Optional[SeedLike] = None,
+        context: Optional[EvaluationContext] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Profit, yield per hectare and risk score of num_sims random perturbations of base_params
+        Perturbations are drawn from rng; forecast_seed (or the context's seed) drives
+        the shared price forecast
+        """
+        if context is None:
+            context = EvaluationContext(self, base_params["crop"], forecast_seed)
+        crop = base_params["crop"]
+        soil_type = base_params["soil_type"]
+        area = base_params["area_hectares"]
+        fertilizer = base_params["fertilizer_mix"]
+        sale_month = base_params.get("sale_month", 3)
+        current_price = base_params.get("current_market_price", 2000)
+        
+        # Rainfall variation (±20%)
+        rainfall = base_params["expected_rainfall"] * (1 + rng.uniform(-0.2, 0.2, num_sims))
+        
+        # Pest probability variation (0-30%)
+        pest_prob = rng.uniform(0, 0.3, num_sims)
+        
+        # Fertilizer variation (±15%)
+        fert_scale = rng.uniform(0.85, 1.15, num_sims)
+        
+        # Price variation (±10%)
+        price_scale = rng.uniform(0.9, 1.1, num_sims)
+        
+        # Plan inputs are scalars; the drawn ones are arrays with one entry per draw
+        inputs = {
+            "area_hectares": area,
+            "seed_quality": base_params["seed_quality"],
+            "seed_quantity_kg": base_params.get("seed_quantity_kg", area * 50),
+            "expected_rainfall": rainfall,
+            "rainfall_delay": base_params["rainfall_delay"],
+            "irrigation_frequency": base_params["irrigation_frequency"],
+            "pest_probability": pest_prob,
+            "labour_days": base_params.get("labour_days", 30),
+            "pest_control_intensity": base_params.get("pest_control_intensity", 0.5),
+            "fertilizer_scale": fert_scale
+        }
+        
+        # Estimate yields for every draw at once
+        yield_result = self.yield_estimator.estimate_yield_batch(
+            crop, soil_type, inputs, fertilizer, base_yield=context.base_yield
+        )
+        yields = np.round(yield_result["yield_per_hectare"], 2)
+        production = np.round(yield_result["total_production_quintals"], 2)
+        
+        total_cost = self.cost_calculator.calculate_cost_batch(crop, inputs, production, fertilizer)["total_cost"]
+        
+        # The forecast path scales linearly with the starting price (drift, shocks and
+        # floor are all relative), so one forecast serves every price draw
+        price_forecast = context.price_forecast(current_price)
+        sale_day = min(59, sale_month * 15)
+        expected_price = price_forecast["forecast_prices"][sale_day] * price_scale
+        
+        profits = production * expected_price - total_cost
+        
+        risks = self.risk_engine.calculate_risk_batch(
+            crop, soil_type, inputs, context.price_stats, np.round(yield_result["confidence"], 2)
+        )["overall_risk_score"]
+        
+        return profits, yields, risks
+    
+    def _run_micro_shard(
+        self,
+        base_params: Dict,
+        num_sims: int,
+        rng: np.random.Generator,
+        forecast_seed: Optional[SeedLike] = None
+    ) -> Dict:
+        """Mergeable partial statistics for one shard of a large Monte Carlo run"""
+        partial = {
+            "profit": RunningMoments(),
+            "profit_quantiles": QuantileSketch(),
+            "yield": RunningMoments(),
+            "risk": RunningMoments(),
+            "profitable": 0
+        }
+        
+        # Evaluate in fixed-size blocks so memory does not grow with the shard size
+        block = config.MONTE_CARLO["block_size"]
+        context = EvaluationContext(self, base_params["crop"], forecast_seed)
+        for start in range(0, num_sims, block):
+            profits, yields, risks = self._draw_micro_outcomes(
+                base_params, min(block, num_sims - start), rng, context=context
+            )
+            partial["profit"].update(profits)
+            partial["profit_quantiles"].update(profits)
+            partial["yield"].update(yields)
+            partial["risk"].update(risks)
+            partial["profitable"] += int(np.count_nonzero(profits > 0))
+        
+        return partial
+    
+    def run_sharded_micro_simulations(
+        self,
+        base_params: Dict,
+        num_sims: int,
+        seed: Optional[int] = None,
+        num_shards: Optional[int] = None,
+        pool: Optional[Executor] = None
+    ) -> Dict:
+        """
+        Large Monte Carlo run split into independently seeded shards
+        Shards run on pool (e.g. a ProcessPoolExecutor) when given, otherwise in-process;
+        results depend only on (seed, num_shards), not on the pool
+        """
+        seed = config.DEFAULT_SEED if seed is None else seed
+        shards = plan_micro_shards(num_sims, seed, num_shards)
+        if pool is None:
+            partials = [run_micro_shard(base_params, *shard, engine=self) for shard in shards]
+        else:
+            partials = list(pool.map(run_micro_shard, [base_params] * len(shards), *zip(*shards)))
+        return summarize_micro_shards(partials, seed)
+    
+    def _generate_recommendation(self, current: Dict, optimal: Dict, worst: Optional[Dict] = None) -> str:
         """Generate natural language recommendation"""
         profit_improvement = optimal["profit"] - current["profit"]
         risk_reduction = current["risk"]["overall_risk_score"] - optimal["risk"]["overall_risk_score"]
@@ -264,3 +655,84 @@ class SimulationEngine:
         recommendation += f"• Plan to sell around day {selling_day} for maximum price\n"
         
         return recommendation
+
+
+def request_seed_sequences(seed: int) -> Tuple[np.random.SeedSequence, np.random.SeedSequence]:
+    """Independent (price forecast, Monte Carlo draws) seed sequences for one request"""
+    forecast_seed, micro_seed = np.random.SeedSequence(seed).spawn(2)
+    return forecast_seed, micro_seed
+
+def optimizer_seed_sequence(seed: int) -> np.random.SeedSequence:
+    """Common-random-number stream of the plan optimizer (third child of the request seed)"""
+    return np.random.SeedSequence(seed, spawn_key=(2,))
+
+def plan_micro_shards(
+    num_sims: int,
+    seed: int,
+    num_shards: Optional[int] = None
+) -> List[Tuple[int, np.random.SeedSequence, np.random.SeedSequence]]:
+    """
+    Split num_sims draws into shards: (size, shard seed sequence, forecast seed sequence)
+    Every shard gets its own stream spawned from the request's Monte Carlo seed
+    """
+    num_shards = max(1, min(num_shards or config.MONTE_CARLO["default_shards"], num_sims))
+    sizes = [num_sims // num_shards + (1 if i < num_sims % num_shards else 0) for i in range(num_shards)]
+    forecast_seed, micro_seed = request_seed_sequences(seed)
+    return [(size, shard_seed, forecast_seed) for size, shard_seed in zip(sizes, micro_seed.spawn(num_shards))]
+
+_shard_engine: Optional[SimulationEngine] = None
+
+def init_shard_engine():
+    """Build this process's shard engine (shard-pool worker initializer)"""
+    global _shard_engine
+    if _shard_engine is None:
+        _shard_engine = SimulationEngine()
+
+def run_micro_shard(
+    base_params: Dict,
+    num_sims: int,
+    shard_seed: np.random.SeedSequence,
+    forecast_seed: np.random.SeedSequence,
+    engine: Optional[SimulationEngine] = None
+) -> Dict:
+    """Worker-process entry point: partial statistics for one shard"""
+    if engine is None:
+        init_shard_engine()
+        engine = _shard_engine
+    return engine._run_micro_shard(base_params, num_sims, np.random.default_rng(shard_seed), forecast_seed)
+
+def summarize_micro_shards(partials: List[Dict], seed: int) -> Dict:
+    """Merge shard partials into the micro-simulation summary format"""
+    merged = partials[0]
+    for partial in partials[1:]:
+        merged["profit"].merge(partial["profit"])
+        merged["profit_quantiles"].merge(partial["profit_quantiles"])
+        merged["yield"].merge(partial["yield"])
+        merged["risk"].merge(partial["risk"])
+        merged["profitable"] += partial["profitable"]
+    
+    profit, yields, risk = merged["profit"], merged["yield"], merged["risk"]
+    return {
+        "num_simulations": profit.count,
+        "num_shards": len(partials),
+        "seed": seed,
+        "profit_stats": {
+            "mean": round(profit.mean, 2),
+            "std": round(profit.std(), 2),
+            "min": round(profit.min, 2),
+            "max": round(profit.max, 2),
+            "percentile_25": round(merged["profit_quantiles"].quantile(0.25), 2),
+            "percentile_75": round(merged["profit_quantiles"].quantile(0.75), 2)
+        },
+        "yield_stats": {
+            "mean": round(yields.mean, 2),
+            "std": round(yields.std(), 2),
+            "min": round(yields.min, 2),
+            "max": round(yields.max, 2)
+        },
+        "risk_stats": {
+            "mean": round(risk.mean, 2),
+            "std": round(risk.std(), 2)
+        },
+        "probability_of_profit": round(merged["profitable"] / profit.count * 100, 2)
+    }
@@ -0,0 +1,165 @@
+"""Columnar .npy snapshots of the parsed datasets, memory-mapped on later boots"""
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+SNAPSHOT_FORMAT = 3
+MANIFEST = "manifest.json"
+
+class Snapshot(NamedTuple):
+    """A loaded snapshot: the typed frame plus its raw (memory-mapped) column arrays"""
+    frame: pd.DataFrame
+    arrays: Dict[str, np.ndarray]
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _source_stamp(source: Path, digest: Optional[str] = None) -> Dict:
+    stat = source.stat()
+    return {
+        "name": source.name,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest or file_digest(source)
+    }
+
+def _read_manifest(directory: Path) -> Optional[Dict]:
+    try:
+        with open(directory / MANIFEST) as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == SNAPSHOT_FORMAT else None
+
+def snapshot_is_current(directory: Path, source: Path, options: Optional[Dict] = None) -> bool:
+    """
+    Whether the snapshot in directory was built from source as it is now,
+    with the same parse options
+    Size and mtime are checked first; the content hash settles the rest
+    (e.g. a file that was copied or touched without changing)
+    """
+    manifest = _read_manifest(directory)
+    if manifest is None or not source.exists():
+        return False
+    if manifest.get("options", {}) != (options or {}):
+        return False
+    
+    recorded = manifest["source"]
+    stat = source.stat()
+    if stat.st_size != recorded["size"]:
+        return False
+    if stat.st_mtime_ns == recorded["mtime_ns"]:
+        return True
+    if file_digest(source) != recorded["sha256"]:
+        return False
+    
+    # Same content under a new mtime: record it so the next boot skips the hash
+    manifest["source"]["mtime_ns"] = stat.st_mtime_ns
+    _write_manifest(directory, manifest)
+    return True
+
+def load_snapshot(directory: Path, source: Path, options: Optional[Dict] = None) -> Optional[Snapshot]:
+    """Memory-map a current snapshot of source, or None if it is missing or stale"""
+    if not snapshot_is_current(directory, source, options):
+        return None
+    manifest = _read_manifest(directory)
+    
+    arrays, columns = {}, {}
+    for column in manifest["columns"]:
+        name, kind = column["name"], column["kind"]
+        values = np.load(directory / column["file"], mmap_mode="r")
+        arrays[name] = values
+        if kind == "datetime":
+            columns[name] = values.view("datetime64[ns]")
+        elif kind == "category":
+            columns[name] = pd.Categorical.from_codes(values, categories=column["categories"])
+        else:
+            columns[name] = values
+    
+    frame = pd.DataFrame(columns, copy=False)
+    frame.attrs.update(manifest.get("attrs", {}))
+    return Snapshot(frame=frame, arrays=arrays)
+
+def write_snapshot(
+    directory: Path,
+    source: Path,
+    frame: pd.DataFrame,
+    options: Optional[Dict] = None,
+    digest: Optional[str] = None
+):
+    """
+    Write frame as one .npy file per column plus a manifest stamped with source
+    and the options it was parsed with
+    Numbers and dates are stored as-is; text columns as integer codes + categories,
+    and frame.attrs (JSON values) in the manifest.
+    The snapshot is assembled next to directory and swapped in with a rename,
+    so concurrent readers never see a partial snapshot
+    """
+    staging = directory.with_name(f"{directory.name}.tmp-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    
+    columns = []
+    for position, name in enumerate(frame.columns):
+        series = frame[name]
+        entry = {"name": str(name), "file": f"{position:03d}.npy"}
+        if pd.api.types.is_datetime64_any_dtype(series):
+            entry["kind"] = "datetime"
+            values = series.to_numpy(dtype="datetime64[ns]").view("i8")
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            entry["kind"] = "numeric"
+            values = series.to_numpy()
+        else:
+            entry["kind"] = "category"
+            categorical = series.astype("category").cat
+            entry["categories"] = [str(category) for category in categorical.categories]
+            values = categorical.codes.to_numpy()
+        np.save(staging / entry["file"], values)
+        columns.append(entry)
+    
+    _write_manifest(staging, {
+        "format": SNAPSHOT_FORMAT,
+        "source": _source_stamp(source, digest),
+        "options": options or {},
+        "rows": len(frame),
+        "attrs": dict(frame.attrs),
+        "columns": columns
+    })
+    
+    # Replace any previous snapshot (a worker that loses the race keeps the winner's copy)
+    retired = directory.with_name(f"{directory.name}.old-{os.getpid()}")
+    try:
+        if directory.exists():
+            directory.rename(retired)
+        staging.rename(directory)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+        shutil.rmtree(retired, ignore_errors=True)
+
+def _write_manifest(directory: Path, manifest: Dict):
+    path = directory / MANIFEST
+    partial = path.with_suffix(".json.tmp")
+    with open(partial, "w") as handle:
+        json.dump(manifest, handle)
+    os.replace(partial, path)
+
+if __name__ == "__main__":
+    # Build step: parse the CSVs once and write snapshots for later boots
+    import config
+    from data_loader import DataLoader
+    
+    loader = DataLoader()
+    for name in ("crop_yield", "mandi_prices"):
+        manifest = _read_manifest(config.SNAPSHOT_DIR / name)
+        status = f"{manifest['rows']} rows" if manifest else "no source data"
+        print(f"{name}: {status} in {config.SNAPSHOT_DIR / name}")
@@ -0,0 +1,152 @@
+"""Mergeable, bounded-memory statistics for large simulation ensembles"""
+import numpy as np
+from typing import Dict, Sequence
+
+class PathQuantileSketch:
+    """
+    Per-day price distribution of an ensemble of paths, kept as fixed log-spaced histograms
+    Memory is days x bins regardless of how many paths are added. Values at or below
+    low (e.g. a price floor) are counted exactly in a separate zero-width bin
+    """
+    
+    def __init__(self, days: int, low: float, high: float, bins: int = 1024):
+        self.days = days
+        self.bins = bins
+        self.log_low = np.log(low)
+        self.bin_width = (np.log(high) - self.log_low) / bins
+        # Column 0 holds values at the lower bound, columns 1..bins the histogram
+        self.counts = np.zeros((days, bins + 1), dtype=np.int64)
+        self.sums = np.zeros(days)
+        self.count = 0
+    
+    def update(self, paths: np.ndarray):
+        """Add a (num_paths, days) block of paths"""
+        offset = np.log(paths) - self.log_low
+        idx = np.floor(offset / self.bin_width).astype(np.int64) + 1
+        np.clip(idx, 1, self.bins, out=idx)
+        idx[offset <= 1e-12] = 0
+        idx += np.arange(self.days) * (self.bins + 1)
+        self.counts += np.bincount(
+            idx.ravel(), minlength=self.days * (self.bins + 1)
+        ).reshape(self.days, self.bins + 1)
+        self.sums += paths.sum(axis=0)
+        self.count += len(paths)
+    
+    def mean(self) -> np.ndarray:
+        """Per-day expected value"""
+        return self.sums / max(self.count, 1)
+    
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Per-day quantiles, shape (len(qs), days), interpolated within histogram bins"""
+        cumulative = np.cumsum(self.counts, axis=1)
+        result = np.empty((len(qs), self.days))
+        rows = np.arange(self.days)
+        for i, q in enumerate(qs):
+            target = q * self.count
+            bin_idx = np.argmax(cumulative >= target, axis=1)
+            below = np.where(bin_idx > 0, cumulative[rows, bin_idx - 1], 0)
+            in_bin = self.counts[rows, bin_idx]
+            fraction = np.where(in_bin > 0, (target - below) / np.maximum(in_bin, 1), 0.0)
+            position = np.where(bin_idx > 0, bin_idx - 1 + fraction, 0.0)
+            result[i] = np.exp(self.log_low + position * self.bin_width)
+        return result
+
+class RunningMoments:
+    """Count, mean, variance, min and max of a stream; mergeable across shards (Chan et al.)"""
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+    
+    def update(self, values: np.ndarray):
+        """Add a block of values"""
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return
+        block = RunningMoments()
+        block.count = len(values)
+        block.mean = float(values.mean())
+        block.m2 = float(((values - block.mean) ** 2).sum())
+        block.min = float(values.min())
+        block.max = float(values.max())
+        self.merge(block)
+    
+    def merge(self, other: "RunningMoments"):
+        """Fold another partial result into this one"""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def std(self) -> float:
+        """Population standard deviation (matches np.std)"""
+        return float(np.sqrt(self.m2 / self.count)) if self.count else 0.0
+
+class QuantileSketch:
+    """
+    Relative-error quantile sketch (DDSketch-style log buckets)
+    Bucket boundaries depend only on the value, so sketches built on different
+    shards merge exactly by adding counts
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.001, min_value: float = 1e-6):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.min_value = min_value
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+    
+    def _add_to_store(self, store: Dict[int, int], magnitudes: np.ndarray):
+        keys, counts = np.unique(np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+    
+    def update(self, values: np.ndarray):
+        """Add a block of values"""
+        values = np.asarray(values, dtype=float)
+        self._add_to_store(self.positive, values[values > self.min_value])
+        self._add_to_store(self.negative, -values[values < -self.min_value])
+        self.zero_count += int(np.count_nonzero(np.abs(values) <= self.min_value))
+        self.count += len(values)
+    
+    def merge(self, other: "QuantileSketch"):
+        """Fold another sketch (same relative accuracy) into this one"""
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+    
+    def _bucket_value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+    
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0-1) within the configured relative accuracy"""
+        if self.count == 0:
+            return float("nan")
+        rank = q * (self.count - 1)
+        seen = 0
+        # Negative values from most negative upwards, then zeros, then positives
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._bucket_value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._bucket_value(key)
+        return self._bucket_value(max(self.positive)) if self.positive else 0.0
@@ -0,0 +1,27 @@
+"""
+Tests of the engines and the API against small synthetic datasets
+
+    cd backend && python -m unittest
+
+Importing this package points config at a temporary directory filled by
+benchmarks.synthetic, so it must happen before any engine module is imported
+(unittest discovery imports it first)
+"""
+import atexit
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+DATA_DIR = Path(tempfile.mkdtemp(prefix="krishi-tests-"))
+atexit.register(shutil.rmtree, DATA_DIR, ignore_errors=True)
+
+os.environ["DATA_DIR"] = str(DATA_DIR)
+os.environ["DATASET_SNAPSHOT_DIR"] = str(DATA_DIR / ".snapshots")
+os.environ["RESPONSE_CACHE_DB"] = ""
+
+import config
+from benchmarks.synthetic import write_crop_yields, write_mandi_prices
+
+write_crop_yields(config.CROP_YIELD_FILE, config.CROPS)
+write_mandi_prices(config.MANDI_PRICE_FILE, 5000)
@@ -0,0 +1,124 @@
+"""The array-native batch engines agree with their scalar counterparts row by row"""
+import unittest
+import numpy as np
+import config
+from cost_calculator import CostCalculator
+from price_forecaster import PriceForecaster
+from risk_engine import RiskEngine
+from yield_estimator import YieldEstimator
+
+ROWS = 64
+# Band edges of the rainfall, irrigation and risk models
+RAINFALL_EDGES = [0, 199, 200, 400, 600, 800, 801, 1200, 1500, 2000, 2001, 3000]
+
+def scenarios(seed: int = 0):
+    """ROWS random plans as a dict of columns plus one fertilizer mix per row"""
+    rng = np.random.default_rng(seed)
+    inputs = {
+        "seed_quality": rng.uniform(0, 1, ROWS),
+        "expected_rainfall": np.concatenate([RAINFALL_EDGES, rng.uniform(0, 3000, ROWS - len(RAINFALL_EDGES))]),
+        "rainfall_delay": rng.integers(0, 40, ROWS),
+        "irrigation_frequency": rng.integers(0, 10, ROWS),
+        "pest_probability": rng.uniform(0, 1, ROWS),
+        "area_hectares": rng.uniform(0.5, 20, ROWS),
+        "seed_quantity_kg": rng.uniform(10, 500, ROWS),
+        "labour_days": rng.uniform(0, 120, ROWS),
+        "pest_control_intensity": rng.uniform(0, 1, ROWS),
+    }
+    names = list(config.FERTILIZERS)
+    mixes = [
+        {name: float(qty) for name, qty in zip(names, rng.uniform(0, 200, len(names))) if qty > 60}
+        for _ in range(ROWS)
+    ]
+    mixes[0], mixes[1] = {}, dict.fromkeys(names, 0.0)
+    return inputs, mixes
+
+def row(inputs, i):
+    return {key: values[i].item() for key, values in inputs.items()}
+
+def loop_paths(current_price: float, trend: float, shocks: np.ndarray, seasonal: np.ndarray) -> np.ndarray:
+    """The original day-by-day forecast loop, fed with the given shocks"""
+    forecast = np.zeros(len(shocks) + 1)
+    forecast[0] = current_price
+    for i in range(1, len(forecast)):
+        price_change = forecast[i-1] * (trend + shocks[i-1] + seasonal[i])
+        forecast[i] = max(current_price * 0.5, forecast[i-1] + price_change)
+    return forecast
+
+class BatchEquivalenceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.inputs, cls.mixes = scenarios()
+        cls.yield_estimator = YieldEstimator()
+        cls.cost_calculator = CostCalculator()
+        cls.risk_engine = RiskEngine(cls.yield_estimator.data_loader)
+    
+    def assertRounded(self, batch, scalar):
+        """batch (unrounded) rounds to the scalar result"""
+        np.testing.assert_allclose(batch, scalar, rtol=0, atol=0.005 + 1e-9)
+    
+    def test_yield(self):
+        for crop, soil in [("Rice", "Alluvial"), ("Cotton", "Black"), ("Potato", "Sandy"), ("Unknown", "Unknown")]:
+            with self.subTest(crop=crop, soil=soil):
+                batch = self.yield_estimator.estimate_yield_batch(crop, soil, self.inputs, self.mixes)
+                for i, mix in enumerate(self.mixes):
+                    values = row(self.inputs, i)
+                    scalar = self.yield_estimator.estimate_yield(
+                        crop, soil, values["seed_quality"], values["expected_rainfall"],
+                        values["rainfall_delay"], values["irrigation_frequency"], mix,
+                        values["pest_probability"], values["area_hectares"]
+                    )
+                    for key in ["yield_per_hectare", "total_production_kg", "total_production_quintals", "confidence"]:
+                        self.assertRounded(batch[key][i], scalar[key])
+    
+    def test_cost(self):
+        production = np.random.default_rng(1).uniform(0, 500, ROWS)
+        for crop in ["Rice", "Sugarcane", "Unknown"]:
+            with self.subTest(crop=crop):
+                batch = self.cost_calculator.calculate_cost_batch(crop, self.inputs, production, self.mixes)
+                for i, mix in enumerate(self.mixes):
+                    values = row(self.inputs, i)
+                    scalar = self.cost_calculator.calculate_cultivation_cost(
+                        crop, values["area_hectares"], values["seed_quantity_kg"], mix,
+                        values["irrigation_frequency"], values["expected_rainfall"], values["labour_days"],
+                        values["pest_control_intensity"], production[i].item()
+                    )
+                    self.assertRounded(batch["total_cost"][i], scalar["total_cost"])
+                    for component, value in scalar["breakdown"].items():
+                        self.assertRounded(batch[component][i], value)
+    
+    def test_risk(self):
+        confidence = np.random.default_rng(2).uniform(0, 1, ROWS)
+        for volatility in [0.1, 0.15, 0.3, 0.5]:
+            with self.subTest(volatility=volatility):
+                stats = {"volatility": volatility}
+                batch = self.risk_engine.calculate_risk_batch("Rice", "Red", self.inputs, stats, confidence)
+                categories = self.risk_engine.categorize_risk_batch(batch["overall_risk_score"])
+                for i in range(ROWS):
+                    values = row(self.inputs, i)
+                    scalar = self.risk_engine.calculate_risk_score(
+                        "Rice", "Red", values["expected_rainfall"], values["rainfall_delay"],
+                        values["pest_probability"], stats, confidence[i].item()
+                    )
+                    self.assertRounded(batch["overall_risk_score"][i], scalar["overall_risk_score"])
+                    self.assertEqual(categories[i], scalar["risk_category"])
+                    for component, value in scalar["components"].items():
+                        self.assertRounded(np.broadcast_to(batch[component], (ROWS,))[i], value)
+
+class ForecastPathTest(unittest.TestCase):
+
+    def test_paths_match_the_daily_loop(self):
+        forecaster = PriceForecaster()
+        rng = np.random.default_rng(3)
+        # High volatility and a falling trend make paths hit the floor and recover
+        for trend, volatility in [(0.001, 0.05), (-0.02, 0.3), (0.01, 0.6)]:
+            with self.subTest(trend=trend, volatility=volatility):
+                shocks = rng.normal(0, volatility, size=(16, 89))
+                paths = forecaster._paths_from_shocks(2000.0, trend, shocks)
+                seasonal = forecaster._generate_seasonal_pattern(90)
+                for shock_row, path in zip(shocks, paths):
+                    np.testing.assert_allclose(path, loop_paths(2000.0, trend, shock_row, seasonal), rtol=1e-9)
+
+if __name__ == "__main__":
+    unittest.main()
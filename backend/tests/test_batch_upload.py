@@ -0,0 +1,51 @@
+"""/simulate_batch/upload and JSON /simulate_batch agree on the same plans"""
+import json
+import unittest
+from fastapi.testclient import TestClient
+import main
+
+PLANS = [
+    {"Urea": 120.0, "DAP": 60.0, "MOP": 40.0},
+    {"Urea": 0.0, "DAP": 0.0, "MOP": 0.0},
+    {"DAP": 80.0},
+    {},
+]
+
+def record(mix):
+    return {
+        "crop": "Rice", "soil_type": "Alluvial", "area_hectares": 2.0, "seed_quality": 0.7,
+        "expected_rainfall": 900.0, "rainfall_delay": 5, "irrigation_frequency": 3,
+        "fertilizer_mix": mix, "pest_probability": 0.2, "labour_days": 30.0
+    }
+
+def upload_csv() -> bytes:
+    fields = [key for key in record({}) if key != "fertilizer_mix"]
+    fertilizers = ["Urea", "DAP", "MOP"]
+    lines = [",".join(fields + [f"fertilizer_{name}" for name in fertilizers])]
+    for mix in PLANS:
+        row = record(mix)
+        lines.append(",".join([str(row[key]) for key in fields] + [str(mix.get(name, "")) for name in fertilizers]))
+    return ("\n".join(lines) + "\n").encode()
+
+def ndjson(response):
+    return sorted((json.loads(line) for line in response.text.splitlines() if line), key=lambda row: row["index"])
+
+class BatchUploadTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(main.app)
+    
+    def test_upload_matches_json_records(self):
+        uploaded = self.client.post("/simulate_batch/upload?seed=7", files={"file": ("plans.csv", upload_csv())})
+        posted = self.client.post("/simulate_batch", json={"records": [record(mix) for mix in PLANS], "seed": 7})
+        self.assertEqual(uploaded.status_code, 200)
+        self.assertEqual(posted.status_code, 200)
+        self.assertEqual(ndjson(uploaded), ndjson(posted))
+    
+    def test_zero_mix_counts_as_no_fertilizer(self):
+        rows = ndjson(self.client.post("/simulate_batch", json={"records": [record(mix) for mix in PLANS], "seed": 7}))
+        self.assertEqual(rows[1]["yield_per_hectare"], rows[3]["yield_per_hectare"])
+
+if __name__ == "__main__":
+    unittest.main()
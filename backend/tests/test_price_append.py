@@ -0,0 +1,61 @@
+"""Price arrivals appended without a reload only invalidate the commodities they touch"""
+import unittest
+import pandas as pd
+from data_loader import DataLoader
+from price_forecaster import PriceForecaster
+
+def arrivals(commodity: str, modal: float) -> pd.DataFrame:
+    return pd.DataFrame({
+        "State": ["Kerala"],
+        "District": ["District"],
+        "Market": ["Market 0"],
+        "Commodity": [commodity],
+        "Arrival_Date": ["01/01/2030"],
+        "Min_x0020_Price": [modal],
+        "Max_x0020_Price": [modal],
+        "Modal_x0020_Price": [modal],
+    })
+
+class PriceAppendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = DataLoader()
+        self.forecaster = PriceForecaster(self.loader)
+    
+    def test_untouched_commodities_keep_their_cached_results(self):
+        wheat = self.loader.get_price_statistics("Wheat")
+        wheat_trend = self.forecaster._get_trend_and_volatility("Wheat")
+        rice = self.loader.get_price_statistics("Rice")
+        generation = self.loader.price_generation("Wheat")
+        
+        # "Broken Rice" is matched by the "rice" query; wheat is untouched
+        self.loader.append_prices(arrivals("Broken Rice", 99999))
+        
+        self.assertEqual(self.loader.price_generation("Wheat"), generation)
+        self.assertGreater(self.loader.price_generation("Rice"), generation)
+        hits = self.loader.price_stats_cache.stats()["hits"]
+        trend_hits = self.forecaster.trend_cache.stats()["hits"]
+        self.assertEqual(self.loader.get_price_statistics("Wheat"), wheat)
+        self.assertEqual(self.forecaster._get_trend_and_volatility("Wheat"), wheat_trend)
+        self.assertEqual(self.loader.price_stats_cache.stats()["hits"], hits + 1)
+        self.assertEqual(self.forecaster.trend_cache.stats()["hits"], trend_hits + 1)
+        
+        updated = self.loader.get_price_statistics("Rice")
+        self.assertNotEqual(updated, rice)
+        self.assertEqual(updated["max"], 99999)
+        self.assertEqual(updated, self.loader._compute_price_statistics("Rice", 180))
+    
+    def test_aliases_are_invalidated_with_their_commodity(self):
+        self.loader.get_price_statistics("Soybean")
+        generation = self.loader.price_generation("Soybean")
+        self.loader.append_prices(arrivals("Soyabean", 99999))
+        self.assertGreater(self.loader.price_generation("Soybean"), generation)
+        self.assertEqual(self.loader.get_price_statistics("Soybean")["max"], 99999)
+    
+    def test_reload_invalidates_everything(self):
+        generation = self.loader.price_generation("Wheat")
+        self.loader.reload()
+        self.assertGreater(self.loader.price_generation("Wheat"), generation)
+
+if __name__ == "__main__":
+    unittest.main()
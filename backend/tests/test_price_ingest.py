@@ -0,0 +1,39 @@
+"""Chunked mandi price ingest: date parsing and history trimming"""
+import io
+import unittest
+import pandas as pd
+from price_ingest import PriceIngester, read_price_chunks
+
+HEADER = "State,Market,Commodity,Arrival_Date,Min_x0020_Price,Max_x0020_Price,Modal_x0020_Price\n"
+
+def ingest(dates, history_rows=0, chunk_rows=2) -> PriceIngester:
+    csv = HEADER + "".join(f"Kerala,M,Rice,{date},1,2,{i}\n" for i, date in enumerate(dates))
+    ingester = PriceIngester(history_rows)
+    for chunk in read_price_chunks(io.BytesIO(csv.encode()), chunk_rows):
+        ingester.add_chunk(chunk)
+    return ingester
+
+class PriceIngestTest(unittest.TestCase):
+
+    def test_day_first_dates(self):
+        frame = ingest(["25/01/2024", "05/08/2023", "13/12/2023"]).frame()
+        self.assertEqual(
+            sorted(frame["Arrival_Date"]),
+            [pd.Timestamp("2023-08-05"), pd.Timestamp("2023-12-13"), pd.Timestamp("2024-01-25")]
+        )
+    
+    def test_other_layouts_fall_back_and_unreadable_dates_are_counted(self):
+        ingester = ingest(["25/01/2024", "2023-08-05", "13-12-2023", "not a date", ""])
+        dates = ingester.frame()["Arrival_Date"]
+        self.assertIn(pd.Timestamp("2023-08-05"), set(dates))
+        self.assertIn(pd.Timestamp("2023-12-13"), set(dates))
+        self.assertEqual(ingester.unparsed_dates, 1)
+    
+    def test_history_is_kept_unless_capped(self):
+        dates = [f"{day:02d}/01/2024" for day in range(1, 11)]
+        self.assertEqual(len(ingest(dates).frame()), 10)
+        capped = ingest(dates, history_rows=3)
+        self.assertEqual(list(capped.frame()["Arrival_Date"].dt.day), [10, 9, 8])
+
+if __name__ == "__main__":
+    unittest.main()
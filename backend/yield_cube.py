@@ -0,0 +1,105 @@
+"""Crop yield time series as a dense (crop, season, year) cube with per-series trend fits"""
+import re
+import numpy as np
+import pandas as pd
+from datetime import date
+from typing import Dict, List, Optional
+
+class YieldCube:
+    """
+    Yields (kg/hectare) of the crop yield dataset indexed by (crop, season, year)
+    Every (crop, season) series carries a least-squares linear trend and the base
+    yield it projects for the projection year, so lookups are two dict hits and
+    a list read
+    """
+    
+    def __init__(
+        self,
+        crop_data: pd.DataFrame,
+        min_years: int = 4,
+        max_horizon_years: int = 3,
+        max_change: float = 0.25,
+        projection_year: int = 0
+    ):
+        yield_cols = [col for col in crop_data.columns if 'Yield' in col]
+        # A crop's first row (in file order) wins when a (crop, season) pair repeats
+        rows = crop_data.drop_duplicates(["Crop", "Season"], keep="first")
+        crop_codes, crops = pd.factorize(rows["Crop"])
+        season_codes, seasons = pd.factorize(rows["Season"])
+        
+        self.crop_ids: Dict[str, int] = {name: i for i, name in enumerate(crops)}
+        self.season_ids: Dict[str, int] = {name: i for i, name in enumerate(seasons)}
+        # Season of each crop's first row (the default series of yield_history)
+        first_rows = crop_data.drop_duplicates("Crop", keep="first")
+        self.first_season: Dict[str, str] = dict(zip(first_rows["Crop"], first_rows["Season"]))
+        self.year_labels: List[str] = [col.split('-')[-1] if '-' in col else col for col in yield_cols]
+        
+        # Crop year of each column ("Yield-2019-20" -> 2019); column positions if unlabelled
+        years = [re.search(r"\d{4}", col) for col in yield_cols]
+        if yield_cols and all(years):
+            self.years = np.array([int(match.group()) for match in years], dtype=float)
+            target = float(projection_year or date.today().year)
+        else:
+            self.years = np.arange(len(yield_cols), dtype=float)
+            target = np.inf
+        
+        self.values = np.full((len(crops), len(seasons), len(yield_cols)), np.nan)
+        if yield_cols:
+            self.values[crop_codes, season_codes] = rows[yield_cols].to_numpy(dtype=float)
+        
+        self.slope, self.intercept, self.observations = self._fit_trends()
+        self.base_yield = self._project(target, min_years, max_horizon_years, max_change)
+        self._base_yield_rows = self.base_yield.tolist()
+    
+    def _fit_trends(self):
+        """Slope and intercept of yield over year for every series (NaN with fewer than 2 points)"""
+        observed = ~np.isnan(self.values)
+        count = observed.sum(axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x_mean = (observed * self.years).sum(axis=-1) / count
+            y_mean = np.nansum(self.values, axis=-1) / count
+            dx = np.where(observed, self.years - x_mean[..., np.newaxis], 0.0)
+            dy = np.where(observed, self.values - y_mean[..., np.newaxis], 0.0)
+            sxx = (dx * dx).sum(axis=-1)
+            slope = np.where(sxx > 0, (dx * dy).sum(axis=-1) / np.where(sxx > 0, sxx, 1.0), np.nan)
+        return slope, y_mean - slope * x_mean, count
+    
+    def _project(self, target: float, min_years: int, max_horizon_years: int, max_change: float) -> np.ndarray:
+        """
+        Trend value at the projection year (at most max_horizon_years past the series'
+        last observation), kept within the observed range widened by max_change;
+        series too short for a trend use their most recent value
+        """
+        if self.values.shape[-1] == 0:
+            return np.full(self.values.shape[:2], np.nan)
+        observed = ~np.isnan(self.values)
+        last = self.values.shape[-1] - 1 - np.argmax(observed[..., ::-1], axis=-1)
+        latest = np.take_along_axis(self.values, last[..., np.newaxis], axis=-1)[..., 0]
+        year = np.minimum(target, self.years[last] + max_horizon_years)
+        
+        with np.errstate(invalid="ignore"):
+            projected = np.clip(
+                self.intercept + self.slope * year,
+                np.nanmin(np.where(observed, self.values, np.inf), axis=-1) * (1 - max_change),
+                np.nanmax(np.where(observed, self.values, -np.inf), axis=-1) * (1 + max_change)
+            )
+        return np.where((self.observations >= min_years) & ~np.isnan(projected), projected, latest)
+    
+    def get_base_yield(self, crop: str, season: str = "Total") -> Optional[float]:
+        """Projected base yield of a series, None if the dataset has no value for it"""
+        crop_id = self.crop_ids.get(crop)
+        season_id = self.season_ids.get(season)
+        if crop_id is None or season_id is None:
+            return None
+        value = self._base_yield_rows[crop_id][season_id]
+        return None if value != value else value  # NaN: no observations
+    
+    def yield_history(self, crop: str, season: Optional[str] = None) -> Dict[str, float]:
+        """Observed yields by year label (default: the crop's first series in the file)"""
+        season = season or self.first_season.get(crop)
+        crop_id = self.crop_ids.get(crop)
+        season_id = self.season_ids.get(season)
+        if crop_id is None or season_id is None:
+            return {}
+        series = self.values[crop_id, season_id]
+        return {label: float(value) for label, value in zip(self.year_labels, series) if not np.isnan(value)}
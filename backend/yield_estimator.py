@@ -1,14 +1,17 @@
 """Yield estimation engine with multi-factor modeling"""
 import numpy as np
-from typing import Dict, Tuple
-import config
-from data_loader import DataLoader
+from typing import Dict, Optional, Tuple
+from batch_inputs import (
+    NPK_MATRIX, BatchInputs, FertilizerInput, batch_column, batch_fertilizer, fertilizer_quantities, mix_applied
+)
+from data_loader import DataLoader, get_data_loader
+from reference import REFERENCE, NameInput
 
 class YieldEstimator:
     """Estimate crop yield based on multiple agricultural factors"""
     
-    def __init__(self):
-        self.data_loader = DataLoader()
+    def __init__(self, data_loader: Optional[DataLoader] = None):
+        self.data_loader = data_loader or get_data_loader()
     
     def estimate_yield(
         self,
@@ -20,14 +23,17 @@ class YieldEstimator:
         irrigation_frequency: int,  # times per month
         fertilizer_mix: Dict[str, float],  # kg per hectare
         pest_probability: float,  # 0-1 scale
-        area_hectares: float = 1.0
+        area_hectares: float = 1.0,
+        base_yield: Optional[float] = None
     ) -> Dict:
         """
         Estimate crop yield with all modifying factors
+        base_yield skips the dataset lookup when the caller already has it
         Returns: yield (kg/hectare), confidence, breakdown
         """
         # Get base yield for the crop
-        base_yield = self.data_loader.get_crop_yield(crop)
+        if base_yield is None:
+            base_yield = self.data_loader.get_crop_yield(crop)
         
         # Apply modifiers
         soil_modifier = self._calculate_soil_modifier(crop, soil_type)
@@ -75,32 +81,83 @@ class YieldEstimator:
             }
         }
     
-    def _calculate_soil_modifier(self, crop: str, soil_type: str) -> float:
-        """Calculate yield modifier based on soil compatibility"""
-        if crop in config.CROP_SOIL_COMPATIBILITY and soil_type in config.CROP_SOIL_COMPATIBILITY[crop]:
-            return config.CROP_SOIL_COMPATIBILITY[crop][soil_type]
-        
-        # Default compatibility for unknown combinations
-        default_compat = {
-            "Alluvial": 0.8, "Black": 0.75, "Red": 0.7, 
-            "Laterite": 0.6, "Desert": 0.4, "Mountain": 0.6,
-            "Clay": 0.75, "Sandy": 0.5
+    def estimate_yield_batch(
+        self,
+        crop: NameInput,
+        soil_type: NameInput,
+        inputs: BatchInputs,
+        fertilizer_mix: Optional[FertilizerInput] = None,
+        base_yield: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Array-native estimate_yield for batch, Monte Carlo and optimizer runs
+        crop and soil_type are names or per-row name arrays (looked up by fancy indexing).
+        inputs holds seed_quality, expected_rainfall, rainfall_delay,
+        irrigation_frequency, pest_probability and optionally area_hectares and
+        fertilizer_scale, as a dict of scalars/arrays that broadcast together,
+        a structured array or a DataFrame.
+        fertilizer_mix is one mix for every row, a list with one mix per row or a
+        quantity matrix (last axis in FERTILIZER_NAMES order); when None it is read
+        from inputs (a fertilizer_mix column or fertilizer_<Name> columns).
+        Returns unrounded arrays: yield, production and confidence
+        """
+        if base_yield is None:
+            base_yield = self.data_loader.get_crop_yield(crop)
+        if fertilizer_mix is None:
+            fertilizer_mix = batch_fertilizer(inputs)
+        
+        seed_quality = batch_column(inputs, "seed_quality")
+        expected_rainfall = batch_column(inputs, "expected_rainfall")
+        pest_probability = batch_column(inputs, "pest_probability")
+        
+        soil_modifier = self._calculate_soil_modifier(crop, soil_type)
+        rainfall_modifier = self._calculate_rainfall_modifier_array(
+            crop, expected_rainfall, batch_column(inputs, "rainfall_delay")
+        )
+        irrigation_modifier = self._calculate_irrigation_modifier_array(
+            batch_column(inputs, "irrigation_frequency"), expected_rainfall
+        )
+        
+        # Mix -> NPK is one matmul; totals scale linearly with the applied quantities
+        quantities, applied = fertilizer_quantities(fertilizer_mix)
+        fertilizer_scale = batch_column(inputs, "fertilizer_scale", 1.0)
+        npk = (quantities @ NPK_MATRIX) * fertilizer_scale[..., np.newaxis]
+        fertilizer_modifier = np.where(applied, self._calculate_fertilizer_modifier_array(crop, npk), 0.7)
+        
+        seed_modifier = self._calculate_seed_modifier(seed_quality)
+        pest_modifier = self._calculate_pest_modifier(pest_probability)
+        
+        total_modifier = (
+            soil_modifier *
+            rainfall_modifier *
+            irrigation_modifier *
+            fertilizer_modifier *
+            seed_modifier *
+            pest_modifier
+        )
+        estimated_yield = base_yield * total_modifier
+        
+        confidence = self._calculate_confidence_array(
+            seed_quality, pest_probability, soil_modifier, rainfall_modifier
+        )
+        total_production = estimated_yield * batch_column(inputs, "area_hectares", 1.0)
+        
+        return {
+            "yield_per_hectare": estimated_yield,
+            "total_production_kg": total_production,
+            "total_production_quintals": total_production / 100,
+            "confidence": confidence
         }
-        return default_compat.get(soil_type, 0.7)
+    
+    def _calculate_soil_modifier(self, crop: NameInput, soil_type: NameInput):
+        """Calculate yield modifier based on soil compatibility (per row for name arrays)"""
+        if isinstance(crop, str) and isinstance(soil_type, str):
+            return REFERENCE.scalar.soil_modifier[REFERENCE.crop_index(crop)][REFERENCE.soil_index(soil_type)]
+        return REFERENCE.soil_modifier[REFERENCE.crop_index(crop), REFERENCE.soil_index(soil_type)]
     
     def _calculate_rainfall_modifier(self, crop: str, rainfall: float, delay: int) -> float:
         """Calculate yield impact of rainfall amount and timing"""
-        # Optimal rainfall ranges by crop type (mm)
-        optimal_ranges = {
-            "Rice": (1000, 1500),
-            "Wheat": (400, 600),
-            "Maize": (600, 900),
-            "Cotton": (600, 1000),
-            "Sugarcane": (1200, 1800),
-        }
-        
-        optimal = optimal_ranges.get(crop, (500, 800))
-        optimal_mid = (optimal[0] + optimal[1]) / 2
+        optimal = REFERENCE.scalar.rainfall_range[REFERENCE.crop_index(crop)]
         
         # Deviation from optimal
         if optimal[0] <= rainfall <= optimal[1]:
@@ -132,35 +189,21 @@ class YieldEstimator:
     
     def _calculate_fertilizer_modifier(self, crop: str, fertilizer_mix: Dict[str, float]) -> float:
         """Calculate yield impact of fertilizer application"""
-        if not fertilizer_mix:
+        if not mix_applied(fertilizer_mix):
             return 0.7  # No fertilizer penalty
         
         # Calculate total NPK applied
-        total_n = sum(
-            qty * config.FERTILIZERS.get(fert, {}).get("N", 0) / 100 
-            for fert, qty in fertilizer_mix.items()
-            if fert in config.FERTILIZERS
-        )
-        total_p = sum(
-            qty * config.FERTILIZERS.get(fert, {}).get("P", 0) / 100
-            for fert, qty in fertilizer_mix.items()
-            if fert in config.FERTILIZERS
-        )
-        total_k = sum(
-            qty * config.FERTILIZERS.get(fert, {}).get("K", 0) / 100
+        nutrients = REFERENCE.scalar.fertilizer_nutrients
+        applied = [
+            (qty, nutrients[REFERENCE.fertilizer_ids[fert]])
             for fert, qty in fertilizer_mix.items()
-            if fert in config.FERTILIZERS
-        )
-        
-        # Optimal NPK ranges (kg/hectare)
-        optimal_npk = {
-            "Rice": (80, 40, 40),
-            "Wheat": (120, 60, 40),
-            "Maize": (100, 50, 50),
-            "Cotton": (100, 50, 50),
-        }
+            if fert in REFERENCE.fertilizer_ids
+        ]
+        total_n = sum(qty * content[0] / 100 for qty, content in applied)
+        total_p = sum(qty * content[1] / 100 for qty, content in applied)
+        total_k = sum(qty * content[2] / 100 for qty, content in applied)
         
-        target = optimal_npk.get(crop, (80, 40, 40))
+        target = REFERENCE.scalar.npk_target[REFERENCE.crop_index(crop)]
         
         # Calculate NPK balance score (0-1)
         n_score = 1.0 - min(0.5, abs(total_n - target[0]) / target[0])
@@ -205,3 +248,41 @@ class YieldEstimator:
         confidence = base_confidence * (1.0 - pest_uncertainty * 0.3)
         
         return min(0.95, max(0.4, confidence))
+    
+    def _calculate_rainfall_modifier_array(self, crop: NameInput, rainfall, delay) -> np.ndarray:
+        """Vectorized _calculate_rainfall_modifier"""
+        optimal = REFERENCE.rainfall_range[REFERENCE.crop_index(crop)]
+        low, high = optimal[..., 0], optimal[..., 1]
+        rainfall = np.asarray(rainfall, dtype=float)
+        
+        deficit_factor = np.maximum(0.4, 1.0 - (low - rainfall) / low * 0.6)
+        excess_factor = np.maximum(0.5, 1.0 - (rainfall - high) / high * 0.4)
+        rainfall_factor = np.where(
+            rainfall < low, deficit_factor, np.where(rainfall > high, excess_factor, 1.0)
+        )
+        
+        delay_factor = np.maximum(0.6, 1.0 - np.maximum(0, delay) * 0.015)
+        return rainfall_factor * delay_factor
+    
+    def _calculate_irrigation_modifier_array(self, frequency, rainfall) -> np.ndarray:
+        """Vectorized _calculate_irrigation_modifier"""
+        rainfall = np.asarray(rainfall, dtype=float)
+        deficit_factor = np.maximum(0, (800 - rainfall) / 800)
+        base_benefit = np.where(
+            rainfall > 800,
+            1.0 + frequency * 0.01,
+            1.0 + frequency * 0.03 * (1 + deficit_factor)
+        )
+        return np.minimum(1.3, base_benefit)
+    
+    def _calculate_fertilizer_modifier_array(self, crop: NameInput, npk: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_fertilizer_modifier over NPK totals (last axis = N, P, K)"""
+        target = REFERENCE.npk_target[REFERENCE.crop_index(crop)]
+        scores = 1.0 - np.minimum(0.5, np.abs(npk - target) / target)
+        return 0.7 + (scores.mean(axis=-1) * 0.5)
+    
+    def _calculate_confidence_array(self, seed_quality, pest_prob, soil_mod, rainfall_mod) -> np.ndarray:
+        """Vectorized _calculate_confidence"""
+        base_confidence = (np.asarray(seed_quality, dtype=float) + soil_mod + rainfall_mod) / 3
+        confidence = base_confidence * (1.0 - np.asarray(pest_prob, dtype=float) * 0.3)
+        return np.clip(confidence, 0.4, 0.95)